@@ -0,0 +1,183 @@
+"""
+Offline RPC/HTTP budget benchmark for the user actions.
+
+Every scenario runs in a fresh interpreter against benchmarks/fake_chain.py
+(cold caches, no network), and reports RPC round trips, RPC calls (batch
+items count individually), HTTP API requests, bytes and wall time. The run
+fails when a scenario exceeds its budget in benchmarks/budgets.json.
+
+    python benchmarks/actions.py                   # all scenarios, checked against budgets
+    python benchmarks/actions.py -s refuel:relay   # one scenario
+    python benchmarks/actions.py -v                # per-method call counts
+    python benchmarks/actions.py --update          # record current counts as the new budgets
+"""
+
+import argparse
+import json
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+BUDGETS_PATH = Path(__file__).resolve().parent / "budgets.json"
+
+# Metrics a scenario must stay within, bytes and wall time are reported only
+BUDGETED = ["rpc_round_trips", "rpc_calls", "http_requests"]
+
+ACCOUNT = {"pk": "0x" + "01" * 32, "proxy": None, "_id": "[1/1]"}
+
+
+
+def swap(dex: str, chain: str, to_eth: bool):
+    def scenario(handler):
+        adapter = handler.context.get(getattr(sys.modules["modules.actions"], dex), chain)
+        return adapter.swap_erc20() if to_eth else adapter.swap_eth()
+
+    return scenario
+
+
+def refuel(dapp: str, chain: str, dest_chain: str):
+    def scenario(handler):
+        return handler.context.get(getattr(sys.modules["modules.actions"], dapp), chain, dest_chain=dest_chain).refuel()
+
+    return scenario
+
+
+# Scenario -> (random seed, what the action does once its prompts are answered)
+SCENARIOS = {
+    "swap_and_bridge": (1, lambda handler: handler.swap_and_bridge()),
+    "swap_eth_to_ousdt:velodrome": (1, swap("Velodrome", "base", to_eth=False)),
+    "swap_eth_to_ousdt:odos": (1, swap("Odos", "base", to_eth=False)),
+    "swap_ousdt_to_eth:velodrome": (1, swap("Velodrome", "optimism", to_eth=True)),
+    "swap_ousdt_to_eth:odos": (1, swap("Odos", "optimism", to_eth=True)),
+    "swap_eth_to_ousdt:best_route": (1, lambda handler: handler._swap("base")),
+    "swap_ousdt_to_eth:best_route": (1, lambda handler: handler._swap("optimism", to_eth=True)),
+    "prompt_and_bridge": (1, lambda handler: handler._bridge("optimism", dest_name="base")),
+    "refuel:gaszip": (1, refuel("GasZip", "optimism", "base")),
+    "refuel:relay": (1, refuel("Relay", "optimism", "base")),
+    "refuel:best": (1, lambda handler: handler.refuel("optimism", "base")),
+}
+
+
+def configure_settings(cache_dir: str) -> None:
+    """Keep pauses and polling short and the caches cold, before any module reads settings."""
+    import settings
+
+    settings.SLEEP_BETWEEN_ACTIONS = [0, 0]
+    settings.SLEEP_BETWEEN_WALLETS = [0, 0]
+    settings.HOPS = [3, 3]
+    settings.RECEIPT_POLL_INTERVAL = 0.05
+    settings.BALANCE_POLL_INTERVAL = 0.05
+    settings.RPC_RATE_LIMIT = 0
+    settings.API_RATE_LIMIT = 0
+    settings.CONSTANTS_CACHE_PATH = os.path.join(cache_dir, "constants.json")
+
+
+def run_scenario(name: str) -> dict:
+    """Run one scenario in this process, returns its stats."""
+    seed, scenario = SCENARIOS[name]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        configure_settings(cache_dir)
+
+        from fake_chain import FakeNetwork, point_at
+
+        network = FakeNetwork().start()
+        point_at(network)
+
+        from modules.actions import ActionHandler
+
+        random.seed(seed)
+        started = time.perf_counter()
+        result = scenario(ActionHandler(dict(ACCOUNT)))
+        wall_time = time.perf_counter() - started
+
+        network.stop()
+
+    # Some actions return None on success, only an explicit False is a failure
+    return {"ok": result is not False, "wall_time": round(wall_time, 3), **network.stats.summary()}
+
+
+def spawn(name: str) -> dict:
+    output = subprocess.run(
+        [sys.executable, __file__, "--child", name],
+        cwd=ROOT,
+        capture_output=True,
+        text=True,
+    )
+
+    if output.returncode != 0:
+        raise RuntimeError(f"{name} failed:\n{output.stderr}")
+
+    return json.loads(output.stdout.splitlines()[-1])
+
+
+def check(name: str, stats: dict, budgets: dict) -> list[str]:
+    budget = budgets.get(name)
+    if budget is None:
+        return [f"{name}: no budget recorded, run with --update"]
+
+    return [
+        f"{name}: {metric} {stats[metric]} > budget {budget[metric]}"
+        for metric in BUDGETED
+        if stats[metric] > budget[metric]
+    ]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("-s", "--scenario", action="append", choices=SCENARIOS, help="default: all")
+    parser.add_argument("-v", "--verbose", action="store_true", help="print per-method call counts")
+    parser.add_argument("--update", action="store_true", help="write the measured counts to budgets.json")
+    parser.add_argument("--child", help=argparse.SUPPRESS)
+    options = parser.parse_args()
+
+    if options.child:
+        sys.path.insert(0, str(ROOT))
+        print(json.dumps(run_scenario(options.child)))
+        return
+
+    budgets = json.loads(BUDGETS_PATH.read_text()) if BUDGETS_PATH.exists() else {}
+    failures = []
+
+    print(
+        f"{'scenario':<30} {'ok':>3} {'rpc trips':>10} {'rpc calls':>10} {'http':>5} "
+        f"{'KiB out':>8} {'KiB in':>8} {'wall s':>7}"
+    )
+
+    for name in options.scenario or SCENARIOS:
+        stats = spawn(name)
+
+        print(
+            f"{name:<30} {'y' if stats['ok'] else 'n':>3} {stats['rpc_round_trips']:>10} {stats['rpc_calls']:>10} "
+            f"{stats['http_requests']:>5} {stats['bytes_sent'] / 1024:>8.1f} {stats['bytes_received'] / 1024:>8.1f} "
+            f"{stats['wall_time']:>7.2f}"
+        )
+
+        if options.verbose:
+            for method, count in stats["methods"].items():
+                print(f"    {method:<60} {count:>5}")
+
+        if not stats["ok"]:
+            failures.append(f"{name}: action reported failure")
+
+        if options.update:
+            budgets[name] = {metric: stats[metric] for metric in BUDGETED}
+        else:
+            failures.extend(check(name, stats, budgets))
+
+    if options.update:
+        BUDGETS_PATH.write_text(json.dumps(budgets, indent=4, sort_keys=True) + "\n")
+        print(f"\nBudgets written to {BUDGETS_PATH.relative_to(ROOT)}")
+
+    if failures:
+        print("\n" + "\n".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,444 @@
+"""
+Local stand-ins for everything an action talks to over the network.
+
+One HTTP server answers
+    /rpc/<chain>   JSON-RPC for every chain in CHAIN_MAPPING (single and batch requests)
+    /odos/...      Odos quote/assemble
+    /relay/...     Relay quote and status
+    /gaszip/...    Gas.zip quote and deposit status
+    /prices/...    the token price API used by Gas.zip
+
+and counts round trips, calls and bytes per chain/API and per method. The
+chain is deliberately simple: every tx succeeds in the next block, every
+receipt carries a Hyperlane DispatchId log, tokens are already approved
+(so swaps don't hit approve()'s fixed pause) and every message is delivered.
+"""
+
+import json
+import os
+import threading
+from collections import defaultdict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+from eth_abi import decode, encode
+from eth_utils import keccak, to_checksum_address
+from eth_utils.abi import function_abi_to_4byte_selector, get_abi_input_types, get_abi_output_types
+
+from modules.config import ABI_FILES, CHAIN_MAPPING, HYPERLANE_DISPATCH_ID_TOPIC, MULTICALL3
+
+MAILBOX = to_checksum_address("0x" + "4d" * 20)
+ODOS_ROUTER = to_checksum_address("0x" + "0d" * 20)
+RELAY_DEPOSITORY = to_checksum_address("0x" + "0e" * 20)
+ZERO_ADDRESS = "0x" + "00" * 20
+
+# Return values by function name, anything else gets zero-ish defaults for its output types
+CALL_RESULTS = {
+    "balanceOf": lambda chain, args: 1_000 * 10**6,
+    "getEthBalance": lambda chain, args: 10**18,
+    "decimals": lambda chain, args: 6,
+    "symbol": lambda chain, args: "oUSDT",
+    "name": lambda chain, args: "OpenUSDT",
+    "allowance": lambda chain, args: 2**256 - 1,
+    "quoteGasPayment": lambda chain, args: 10**13,
+    "localDomain": lambda chain, args: chain.chain_id,
+    "mailbox": lambda chain, args: MAILBOX,
+    "delivered": lambda chain, args: True,
+    "quoteExactInput": lambda chain, args: (10**6, [], [], 150_000),
+}
+
+
+def _default(abi_type: str):
+    if abi_type.endswith("]"):
+        return []
+    if abi_type == "bool":
+        return False
+    if abi_type == "address":
+        return ZERO_ADDRESS
+    if abi_type == "string":
+        return ""
+    if abi_type == "bytes":
+        return b""
+    if abi_type.startswith("bytes"):
+        return b"\x00" * int(abi_type[5:])
+    return 0
+
+
+def _load_functions() -> dict[bytes, dict]:
+    functions = {}
+
+    for path in ABI_FILES.values():
+        with open(path) as f:
+            for element in json.load(f):
+                if element.get("type") == "function":
+                    functions.setdefault(function_abi_to_4byte_selector(element), element)
+
+    return functions
+
+
+class Stats:
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.round_trips = defaultdict(int)
+        self.calls = defaultdict(int)
+        self.bytes_in = defaultdict(int)
+        self.bytes_out = defaultdict(int)
+        self.methods = defaultdict(int)
+
+    def record(self, target: str, methods: list[str], bytes_in: int, bytes_out: int) -> None:
+        with self._lock:
+            self.round_trips[target] += 1
+            self.calls[target] += len(methods)
+            self.bytes_in[target] += bytes_in
+            self.bytes_out[target] += bytes_out
+
+            for method in methods:
+                self.methods[f"{target} {method}"] += 1
+
+    def summary(self) -> dict:
+        with self._lock:
+            rpc = [target for target in self.round_trips if target.startswith("rpc:")]
+            api = [target for target in self.round_trips if not target.startswith("rpc:")]
+
+            return {
+                "rpc_round_trips": sum(self.round_trips[target] for target in rpc),
+                "rpc_calls": sum(self.calls[target] for target in rpc),
+                "http_requests": sum(self.round_trips[target] for target in api),
+                "bytes_sent": sum(self.bytes_in.values()),
+                "bytes_received": sum(self.bytes_out.values()),
+                "targets": {target: self.round_trips[target] for target in sorted(self.round_trips)},
+                "methods": dict(sorted(self.methods.items())),
+            }
+
+
+class FakeChain:
+    """JSON-RPC state for one chain."""
+
+    def __init__(self, network, functions: dict[bytes, dict]):
+        self.network = network
+        self.functions = functions
+        self.block = 1_000
+        self.receipts = {}
+        self._lock = threading.Lock()
+
+    def handle(self, method: str, params: list):
+        handler = getattr(self, method, None)
+        if handler is None:
+            raise ValueError(f"Method {method} not supported")
+
+        return handler(*params)
+
+    def eth_chainId(self):
+        return hex(self.network.chain_id)
+
+    def eth_blockNumber(self):
+        # Every poll sees a new head, so waiters resolve on their first check
+        with self._lock:
+            self.block += 1
+            return hex(self.block)
+
+    def eth_getBlockByNumber(self, block="latest", full=False):
+        return {
+            "number": hex(self.block),
+            "hash": "0x" + keccak(self.block.to_bytes(32, "big")).hex(),
+            "parentHash": "0x" + "00" * 32,
+            "baseFeePerGas": hex(10**6),
+            "timestamp": hex(1_700_000_000 + self.block * 2),
+            "gasLimit": hex(30_000_000),
+            "gasUsed": hex(15_000_000),
+            "extraData": "0x",
+            "transactions": [],
+            "miner": ZERO_ADDRESS,
+            "difficulty": "0x0",
+            "nonce": "0x0000000000000000",
+            "logsBloom": "0x" + "00" * 256,
+            "sha3Uncles": "0x" + "00" * 32,
+            "stateRoot": "0x" + "00" * 32,
+            "receiptsRoot": "0x" + "00" * 32,
+            "transactionsRoot": "0x" + "00" * 32,
+            "size": "0x1",
+            "uncles": [],
+        }
+
+    def eth_feeHistory(self, count, block, percentiles):
+        return {
+            "oldestBlock": hex(self.block),
+            "baseFeePerGas": [hex(10**6), hex(10**6)],
+            "gasUsedRatio": [0.5],
+            "reward": [[hex(10**5)] * len(percentiles)],
+        }
+
+    def eth_maxPriorityFeePerGas(self):
+        return hex(10**5)
+
+    def eth_gasPrice(self):
+        return hex(2 * 10**6)
+
+    def eth_getTransactionCount(self, address, block="latest"):
+        return "0x0"
+
+    def eth_getBalance(self, address, block="latest"):
+        return hex(10**18)
+
+    def eth_estimateGas(self, tx, block=None):
+        return hex(200_000)
+
+    def eth_call(self, tx, block="latest"):
+        return "0x" + self._call(tx["to"], bytes.fromhex(tx.get("data", tx.get("input", "0x"))[2:])).hex()
+
+    def _call(self, to: str, data: bytes) -> bytes:
+        function = self.functions.get(data[:4])
+        if function is None:
+            raise ValueError(f"Unknown selector 0x{data[:4].hex()} on {to}")
+
+        args = decode(get_abi_input_types(function), data[4:])
+        output_types = get_abi_output_types(function)
+
+        if function["name"] == "aggregate3" and to.lower() == MULTICALL3.lower():
+            results = [(True, self._call(target, calldata)) for target, _, calldata in args[0]]
+            return encode(output_types, [results])
+
+        if function["name"] in CALL_RESULTS:
+            values = CALL_RESULTS[function["name"]](self.network, args)
+            values = values if len(output_types) > 1 else (values,)
+        else:
+            values = [_default(abi_type) for abi_type in output_types]
+
+        return encode(output_types, values)
+
+    def eth_sendRawTransaction(self, raw: str):
+        tx_hash = "0x" + keccak(hexstr=raw).hex()
+
+        with self._lock:
+            self.receipts[tx_hash] = self._receipt(tx_hash, block=self.block + 1)
+
+        return tx_hash
+
+    def eth_getTransactionReceipt(self, tx_hash: str):
+        receipt = self.receipts.get(tx_hash)
+
+        if receipt is None or int(receipt["blockNumber"], 16) > self.block:
+            return None
+
+        return receipt
+
+    def _receipt(self, tx_hash: str, block: int) -> dict:
+        block_hash = "0x" + keccak(block.to_bytes(32, "big")).hex()
+        location = {
+            "blockHash": block_hash,
+            "blockNumber": hex(block),
+            "transactionHash": tx_hash,
+            "transactionIndex": "0x0",
+        }
+
+        return {
+            **location,
+            "from": ZERO_ADDRESS,
+            "to": ZERO_ADDRESS,
+            "contractAddress": None,
+            "cumulativeGasUsed": hex(200_000),
+            "effectiveGasPrice": hex(2 * 10**6),
+            "gasUsed": hex(200_000),
+            "logsBloom": "0x" + "00" * 256,
+            "status": "0x1",
+            "type": "0x2",
+            "logs": [
+                {
+                    **location,
+                    "address": MAILBOX,
+                    "topics": [HYPERLANE_DISPATCH_ID_TOPIC, "0x" + keccak(hexstr=tx_hash).hex()],
+                    "data": "0x",
+                    "logIndex": "0x0",
+                    "removed": False,
+                }
+            ],
+        }
+
+
+class StubAPIs:
+    """Canned Odos, Relay, Gas.zip and price API responses."""
+
+    def handle(self, method: str, path: str, query: dict, body: dict | None) -> tuple[str, dict]:
+        if path == "/odos/sor/quote/v2":
+            return "odos", {
+                "pathId": "path",
+                "outAmounts": [str(10**6)],
+                "gasEstimate": 250_000,
+                "netOutValue": 3.0,
+                "pathViz": {"links": [{"out_value": 0.001}]},
+            }
+        if path == "/odos/sor/assemble":
+            return "odos", {"transaction": {"to": ODOS_ROUTER, "data": "0x" + "00" * 68}}
+
+        if path == "/relay/quote":
+            return "relay", self._relay_quote(body)
+        if path == "/relay/intents/status":
+            return "relay", {"status": "success"}
+        if path == "/relay/requests/v2":
+            return "relay", {"requests": [{"data": {"metadata": {"currencyOut": {"amountUsd": "1.0"}}}}]}
+
+        if path.startswith("/gaszip/quotes/"):
+            _, amount, dest_chain_id = path.rsplit("/", 2)
+            quote = {"chain": int(dest_chain_id), "expected": str(int(amount) * 98 // 100), "speed": 5, "usd": 1.0}
+            return "gaszip", {"calldata": "0x010203", "quotes": [quote]}
+        if path.startswith("/gaszip/deposit/"):
+            return "gaszip", {"deposit": {"status": "CONFIRMED", "usd": 1.0}}
+
+        if path == "/prices/ticker/price":
+            return "prices", {"symbol": query.get("symbol", [""])[0], "price": "3000.0"}
+
+        raise ValueError(f"No stub for {method} {path}")
+
+    @staticmethod
+    def _relay_quote(body: dict) -> dict:
+        metadata = {"logoURI": "", "verified": True, "isNative": True}
+        currency = {"chainId": 1, "address": ZERO_ADDRESS, "symbol": "ETH", "name": "Ether", "decimals": 18}
+        amount = {
+            "currency": {**currency, "metadata": metadata},
+            "amount": body["amount"],
+            "amountFormatted": "0",
+            "amountUsd": "1.0",
+            "minimumAmount": body["amount"],
+        }
+        impact = {"usd": "0", "percent": "0"}
+
+        return {
+            "steps": [
+                {
+                    "id": "deposit",
+                    "action": "Confirm transaction",
+                    "description": "Depositing funds to the relayer",
+                    "kind": "transaction",
+                    "requestId": "0x" + "ab" * 32,
+                    "depositAddress": "",
+                    "items": [
+                        {
+                            "status": "incomplete",
+                            "data": {
+                                "from": body["user"],
+                                "to": RELAY_DEPOSITORY,
+                                "data": "0x",
+                                "value": body["amount"],
+                                "chainId": body["originChainId"],
+                                "gas": "21000",
+                                "maxFeePerGas": str(2 * 10**6),
+                                "maxPriorityFeePerGas": str(10**5),
+                            },
+                            "check": {"endpoint": "/intents/status", "method": "GET"},
+                        }
+                    ],
+                }
+            ],
+            "fees": {name: amount for name in ["gas", "relayer", "relayerGas", "relayerService", "app"]},
+            "details": {
+                "operation": "send",
+                "sender": body["user"],
+                "recipient": body["recipient"],
+                "currencyIn": amount,
+                "currencyOut": amount,
+                "totalImpact": impact,
+                "swapImpact": impact,
+                "rate": "1",
+                "slippageTolerance": {"origin": {**impact, "value": "0"}, "destination": {**impact, "value": "0"}},
+                "timeEstimate": 2,
+                "userBalance": "0",
+            },
+        }
+
+
+class FakeNetwork:
+    """The fake chains and APIs behind one local HTTP server."""
+
+    def __init__(self):
+        functions = _load_functions()
+
+        self.chains = {name: FakeChain(network, functions) for name, network in CHAIN_MAPPING.items()}
+        self.apis = StubAPIs()
+        self.stats = Stats()
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address
+        return f"http://{host}:{port}"
+
+    def start(self) -> "FakeNetwork":
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        return self
+
+    def stop(self) -> None:
+        self.server.shutdown()
+
+    def _rpc(self, chain: FakeChain, request: dict) -> dict:
+        try:
+            return {"jsonrpc": "2.0", "id": request["id"], "result": chain.handle(request["method"], request["params"])}
+        except Exception as err:
+            return {"jsonrpc": "2.0", "id": request["id"], "error": {"code": -32000, "message": str(err)}}
+
+    def _handler(self):
+        network = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            # Headers and body go out as separate writes, Nagle + delayed ACK would add ~40ms to each
+            disable_nagle_algorithm = True
+
+            def _reply(self, target: str, methods: list[str], body: bytes, payload) -> None:
+                data = json.dumps(payload).encode()
+                network.stats.record(target, methods, len(body), len(data))
+
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def _handle(self, method: str) -> None:
+                body = self.rfile.read(int(self.headers.get("Content-Length") or 0))
+                url = urlparse(self.path)
+
+                if url.path.startswith("/rpc/"):
+                    chain = network.chains[url.path.removeprefix("/rpc/")]
+                    request = json.loads(body)
+
+                    if isinstance(request, list):
+                        methods = [item["method"] for item in request]
+                        payload = [network._rpc(chain, item) for item in request]
+                    else:
+                        methods = [request["method"]]
+                        payload = network._rpc(chain, request)
+
+                    return self._reply(f"rpc:{chain.network.name}", methods, body, payload)
+
+                api, payload = network.apis.handle(method, url.path, parse_qs(url.query), json.loads(body or "null"))
+                self._reply(f"api:{api}", [f"{method} {url.path}"], body, payload)
+
+            def do_GET(self):
+                self._handle("GET")
+
+            def do_POST(self):
+                self._handle("POST")
+
+            def log_message(self, *args):
+                pass
+
+        return Handler
+
+
+def point_at(network: FakeNetwork) -> None:
+    """Redirect every chain RPC and HTTP API used by the actions to `network`."""
+    from modules import utils
+    from modules.gaszip import GasZip
+    from modules.odos import Odos
+    from modules.relay import Relay
+
+    for name, chain in CHAIN_MAPPING.items():
+        chain.rpc_urls = [f"{network.url}/rpc/{name}"]
+
+    Odos.BASE_URL = f"{network.url}/odos"
+    Relay.BASE_URL = f"{network.url}/relay"
+    GasZip.BASE_URL = f"{network.url}/gaszip"
+    utils.PRICE_API_URL = f"{network.url}/prices"
+
+    # Stub responses are plain HTTP on localhost, keep any configured proxy out of the way
+    os.environ["NO_PROXY"] = "127.0.0.1,localhost"
@@ -0,0 +1,70 @@
+"""
+Time-to-first-prompt benchmark.
+
+Runs `import main` in fresh interpreters (everything main needs before the
+first questionary prompt) and reports the wall time along with the
+cumulative import cost of the heaviest modules, taken from `-X importtime`.
+
+    python benchmarks/startup.py [--runs 5] [--top 15] [--target 1.0]
+"""
+
+import argparse
+import statistics
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+
+
+def run_interpreter(code: str, importtime: bool = False) -> tuple[float, str]:
+    args = [sys.executable, *(["-X", "importtime"] if importtime else []), "-c", code]
+
+    started = time.perf_counter()
+    result = subprocess.run(args, cwd=ROOT, capture_output=True, text=True, check=True)
+
+    return time.perf_counter() - started, result.stderr
+
+
+def parse_importtime(output: str) -> dict[str, tuple[int, int]]:
+    """Module -> (self, cumulative) import time in microseconds."""
+    modules = {}
+
+    for line in output.splitlines():
+        if not line.startswith("import time:") or "self [us]" in line:
+            continue
+
+        own, cumulative, name = line.removeprefix("import time:").split("|")
+        modules[name.strip()] = (int(own), int(cumulative))
+
+    return modules
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--top", type=int, default=15)
+    parser.add_argument("--target", type=float, default=1.0, help="seconds; exit with status 1 when exceeded")
+    options = parser.parse_args()
+
+    baseline = statistics.median(run_interpreter("pass")[0] for _ in range(options.runs))
+    startup = statistics.median(run_interpreter("import main")[0] for _ in range(options.runs))
+
+    _, output = run_interpreter("import main", importtime=True)
+    modules = parse_importtime(output)
+
+    print(f"{'module':<50} {'self ms':>10} {'cumulative ms':>15}")
+    for name, (own, cumulative) in sorted(modules.items(), key=lambda item: item[1][1], reverse=True)[: options.top]:
+        print(f"{name:<50} {own / 1000:>10.1f} {cumulative / 1000:>15.1f}")
+
+    print()
+    print(f"Interpreter startup:  {baseline:.3f}s")
+    print(f"Time to first prompt: {startup:.3f}s (median of {options.runs}, target {options.target:.1f}s)")
+
+    if startup > options.target:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
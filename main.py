@@ -1,22 +1,27 @@
 import random
+from typing import TYPE_CHECKING
 
 import questionary
 from questionary import Choice
 
 import settings
-from modules.actions import Action
 from modules.config import q_style
 from modules.logger import logger
-from modules.utils import read_file, sleep
+from modules.metrics import metrics
 
+# web3 and the action modules are imported after the first prompt, they dominate startup time
+if TYPE_CHECKING:
+    from modules.actions import Action
 
-def get_action() -> Action:
+
+def get_action() -> "Action":
     choices = [
-        Choice("Swap and bridge oUSDT", Action("swap_and_bridge")),
-        Choice("Swap ETH > oUSDT", Action("swap_eth_to_ousdt")),
-        Choice("Swap oUSDT > ETH", Action("swap_ousdt_to_eth")),
-        Choice("Bridge to selected chain", Action("prompt_and_bridge")),
-        Choice("Refuel to selected chain", Action("refuel")),
+        Choice("Swap and bridge oUSDT", "swap_and_bridge"),
+        Choice("Swap ETH > oUSDT", "swap_eth_to_ousdt"),
+        Choice("Swap oUSDT > ETH", "swap_ousdt_to_eth"),
+        Choice("Bridge to selected chain", "prompt_and_bridge"),
+        Choice("Refuel to selected chain", "refuel"),
+        Choice("Clear constants cache", "clear_cache"),
         Choice("Quit", "quit"),
     ]
     action = questionary.select(
@@ -28,10 +33,21 @@ def get_action() -> Action:
     if action == "quit" or action is None:
         quit()
 
-    return action
+    if action == "clear_cache":
+        from modules.cache import constants_cache
+
+        count = constants_cache.clear()
+        logger.success(f"Removed {count} cached on-chain constants")
+        quit()
+
+    from modules.actions import Action
+
+    return Action(action)
 
 
 def get_accounts() -> list[dict]:
+    from modules.utils import read_file
+
     keys = read_file("keys.txt")
     proxies = read_file("proxies.txt", prefix="http://")
 
@@ -58,11 +74,17 @@ def main():
     action = get_action()
     accounts = get_accounts()
 
-    for index, account in enumerate(accounts, start=1):
-        tx_status = action(account)
+    from modules.cache import constants_cache
+    from modules.runner import run_local, run_sharded
 
-        if tx_status and index < len(accounts):
-            sleep(*settings.SLEEP_BETWEEN_WALLETS)
+    try:
+        if settings.PROCESSES > 1 and not action.interactive:
+            run_sharded(action, accounts, settings.PROCESSES)
+        else:
+            run_local(action, accounts)
+    finally:
+        constants_cache.save()
+        metrics.report(settings.METRICS_PATH)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,22 @@
+from pydantic import BaseModel, ConfigDict
+
+
+class ChainBalance(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    native: int
+    ousdt: int
+
+
+class BalanceSnapshot(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    address: str
+    chains: dict[str, ChainBalance]
+
+    def native(self, chain: str) -> float:
+        return self.chains[chain].native / 10**18
+
+    def merge(self, other: "BalanceSnapshot") -> "BalanceSnapshot":
+        """New snapshot with `other`'s chains replacing ours."""
+        return BalanceSnapshot(address=self.address, chains={**self.chains, **other.chains})
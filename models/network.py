@@ -3,11 +3,15 @@ from pydantic import BaseModel
 
 class Network(BaseModel):
     name: str
-    rpc_url: str
+    rpc_urls: list[str]  # first is the default, the others share reads and take over on failure
     explorer: str
     eip_1559: bool
     chain_id: int
     native_token: str
 
+    @property
+    def rpc_url(self) -> str:
+        return self.rpc_urls[0]
+
     def __str__(self):
         return self.name
@@ -0,0 +1,13 @@
+from typing import Any
+
+from pydantic import BaseModel, ConfigDict
+
+
+class RouteQuote(BaseModel):
+    model_config = ConfigDict(frozen=True)
+
+    amount_in: int
+    amount_out: int  # smallest units of the output token (or wei delivered by a refuel), before slippage
+    gas: int  # estimated gas of the whole source chain tx
+    eta: float | None = None  # seconds until a refuel is delivered, as quoted by the provider
+    data: Any = None  # the provider's own quote, e.g. the Odos path to assemble or the Relay steps
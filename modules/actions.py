@@ -3,21 +3,43 @@ import random
 from questionary import select
 
 import settings
+from models.balances import BalanceSnapshot
 
-from .config import q_style
+from .balances import take_snapshot
+from .breaker import CircuitOpenError
+from .config import OUSDT, q_style
+from .context import AccountContext
 from .gaszip import GasZip
-from .odos import Odos
+from .logger import logger
+from .odos import Odos, odos_breaker
 from .relay import Relay
-from .utils import random_sleep
+from .routing import best_refuel, best_route
+from .scheduler import Flow, random_pause, run_steps
+from .utils import wei
 from .velodrome import Velodrome
-from .wallet import Wallet
 from .xerc20 import HypXERC20
 
 
 class Action:
+    # Actions that prompt for chains, these always run one account at a time
+    INTERACTIVE = {"swap_eth_to_ousdt", "swap_ousdt_to_eth", "prompt_and_bridge", "refuel"}
+
     def __init__(self, method_name: str):
         self.method_name = method_name
 
+    @property
+    def interactive(self) -> bool:
+        return self.method_name in self.INTERACTIVE
+
+    @property
+    def resumable(self) -> bool:
+        """Whether the action has a `<method>_steps` flow the StepScheduler can park and resume."""
+        return hasattr(ActionHandler, f"{self.method_name}_steps")
+
+    def steps(self, account: dict) -> Flow:
+        handler = ActionHandler(account)
+        return getattr(handler, f"{self.method_name}_steps")()
+
     def __call__(self, account: dict) -> bool:
         handler = ActionHandler(account)
         method = getattr(handler, self.method_name, None)
@@ -35,6 +57,9 @@ class ActionHandler:
     def __init__(self, account):
         self.account = account
         self.current_chain = None
+        self.context = AccountContext(account)
+        self.address = self.context.address
+        self.balances: BalanceSnapshot | None = None
 
     @property
     def min_balance_required(self):
@@ -42,11 +67,24 @@ class ActionHandler:
 
     # ========================= Helper methods ========================= #
 
+    def _refresh_balances(self, *chains: str) -> BalanceSnapshot:
+        """Re-read balances on `chains` only (all known chains on first call), in parallel."""
+
+        if self.balances is None:
+            all_chains = [*settings.STARTING_CHAINS, *settings.AVAILABLE_CHAINS, *chains]
+            self.balances = take_snapshot(self.address, all_chains)
+        elif chains:
+            self.balances = self.balances.merge(take_snapshot(self.address, list(chains)))
+
+        return self.balances
+
     def _get_balance_for_chain(self, chain: str) -> float:
         """Get ETH balance for a specific chain."""
 
-        wallet = Wallet(pk=self.account["pk"], _id=self.account["_id"], chain=chain)
-        return wallet.get_balance(human=True)
+        if self.balances is None or chain not in self.balances.chains:
+            self._refresh_balances(chain)
+
+        return self.balances.native(chain)
 
     def _select_starting_chain(self):
         """Select a starting chain that has a balance > the minimum required."""
@@ -65,15 +103,61 @@ class ActionHandler:
         """Select a random DEX for the given chain."""
 
         dex_list = [Velodrome, Odos]
-        return random.choice(dex_list)(**self.account, chain=chain)
+
+        # Velodrome quotes on-chain, so it stays available while the Odos API is routed around
+        if odos_breaker.is_open:
+            dex_list = [Velodrome]
+
+        return self.context.get(random.choice(dex_list), chain)
+
+    def _get_swap_amount(self, chain, to_eth=False) -> int:
+        """Amount to swap: random ETH, or a share of the oUSDT balance (from the snapshot, if taken)."""
+
+        if not to_eth:
+            return wei(random.uniform(*settings.SWAP_AMOUNT))
+
+        if self.balances is not None and chain in self.balances.chains:
+            balance = self.balances.chains[chain].ousdt
+        else:
+            balance = self.context.get(Velodrome, chain).get_balance(OUSDT)
+
+        return int(balance * random.uniform(*settings.SWAP_BACK_PERCENTAGE))
+
+    def _get_best_route(self, chain, to_eth=False):
+        """Quote the same amount on every available DEX in parallel and pick the best net output."""
+
+        dex_list = [Velodrome] if odos_breaker.is_open else [Velodrome, Odos]
+        amount_in = self._get_swap_amount(chain, to_eth)
+
+        # Nothing to quote, let the DEX report the empty balance
+        if not amount_in:
+            return self.context.get(Velodrome, chain), None
+
+        dexes = [self.context.get(dex, chain) for dex in dex_list]
+        return best_route(dexes, amount_in, to_eth, deadline=settings.QUOTE_DEADLINE)
 
     def _swap(self, chain="base", to_eth=False):
         """Perform a swap on the specified chain."""
 
-        dex = self._get_random_dex(chain)
-        return dex.swap_erc20() if to_eth else dex.swap_eth()
+        if settings.BEST_ROUTE:
+            dex, route = self._get_best_route(chain, to_eth)
+        else:
+            dex, route = self._get_random_dex(chain), None
+
+        try:
+            status = dex.swap_erc20(route=route) if to_eth else dex.swap_eth(route=route)
+        except CircuitOpenError as err:
+            # Odos went down before its tx was assembled, nothing was sent yet
+            logger.warning(f"{dex.label} {err}, swapping through Velodrome instead")
+            dex = self.context.get(Velodrome, chain)
+            status = dex.swap_erc20() if to_eth else dex.swap_eth()
+
+        if self.balances is not None:
+            self._refresh_balances(chain)
 
-    def _ensure_gas_on_destination(self, dest_chain: str) -> None:
+        return status
+
+    def _ensure_gas_on_destination_steps(self, dest_chain: str) -> Flow:
         """Ensure the destination chain has sufficient gas."""
 
         if self._get_balance_for_chain(dest_chain) < self.REFUEL_THRESHOLD:
@@ -84,9 +168,10 @@ class ActionHandler:
             refuel_source = max(balances, key=balances.get)
 
             if balances[refuel_source] > max(settings.REFUEL_AMOUNT):
-                dapp = self._get_random_refuel(chain=refuel_source, dest_chain=dest_chain)
-                dapp.refuel()
-                random_sleep(*settings.SLEEP_BETWEEN_ACTIONS)
+                dapp, route = self._get_refuel(chain=refuel_source, dest_chain=dest_chain)
+                dapp.refuel(route=route)
+                self._refresh_balances(refuel_source, dest_chain)
+                yield random_pause(*settings.SLEEP_BETWEEN_ACTIONS)
             else:
                 raise Exception(f"No refuel source with sufficient balance")
 
@@ -94,38 +179,57 @@ class ActionHandler:
         """Select a random dapp for refuel."""
 
         refuel_list = [GasZip, Relay]
-        return random.choice(refuel_list)(**self.account, chain=chain, dest_chain=dest_chain)
+        return self.context.get(random.choice(refuel_list), chain, dest_chain=dest_chain)
 
-    def _bridge(self, chain, dest_name=None):
+    def _get_refuel(self, chain=None, dest_chain=None):
+        """Quote the same amount with every refuel dapp in parallel and pick the best, or a random one."""
+
+        if not settings.BEST_REFUEL:
+            return self._get_random_refuel(chain, dest_chain=dest_chain), None
+
+        dapps = [self.context.get(dapp, chain, dest_chain=dest_chain) for dapp in (GasZip, Relay)]
+        amount = wei(random.uniform(*settings.REFUEL_AMOUNT))
+
+        return best_refuel(dapps, amount, deadline=settings.QUOTE_DEADLINE)
+
+    def _bridge_steps(self, chain, dest_name=None) -> Flow:
         """Bridge tokens to a random destination after ensuring sufficient gas."""
 
-        bridge = HypXERC20(**self.account, chain=chain)
+        bridge = self.context.get(HypXERC20, chain)
 
         dest_name = dest_name or bridge.get_random_dest()
         dest_id = bridge.get_dest_id_by_name(dest_name)
 
-        self._ensure_gas_on_destination(dest_name)
-        return dest_name if bridge.transfer_remote(dest_id) else False
+        yield from self._ensure_gas_on_destination_steps(dest_name)
+
+        delivery = bridge.send_remote(dest_id)
+        status = (yield delivery) if delivery else False
+        self._refresh_balances(chain, dest_name)
+
+        return dest_name if status else False
+
+    def _bridge(self, chain, dest_name=None):
+        return run_steps(self._bridge_steps(chain, dest_name))
 
     def _perform_initial_swap(self) -> bool:
         """Perform the initial swap on a random starting chain."""
 
         return self._swap(chain=self.current_chain)
 
-    def _perform_intermediate_bridges(self, hops: int) -> bool:
+    def _perform_intermediate_bridges_steps(self, hops: int) -> Flow:
         """Perform intermediate bridges across chains."""
 
         for _ in range(hops - 1):
-            next_dest = self._bridge(self.current_chain)
+            next_dest = yield from self._bridge_steps(self.current_chain)
 
             if not next_dest:
                 return False
 
             self.current_chain = next_dest
-            random_sleep(*settings.SLEEP_BETWEEN_ACTIONS)
+            yield random_pause(*settings.SLEEP_BETWEEN_ACTIONS)
         return True
 
-    def _perform_final_bridge_and_swap(self) -> bool:
+    def _perform_final_bridge_and_swap_steps(self) -> Flow:
         """Bridge to final destination and swap to ETH."""
 
         match self.current_chain:
@@ -136,18 +240,18 @@ class ActionHandler:
             case _:
                 final_dest = random.choice(["base", "optimism"])
 
-        self.current_chain = self._bridge(self.current_chain, dest_name=final_dest)
+        self.current_chain = yield from self._bridge_steps(self.current_chain, dest_name=final_dest)
 
         if not self.current_chain:
             return False
 
-        random_sleep(*settings.SLEEP_BETWEEN_ACTIONS)
+        yield random_pause(*settings.SLEEP_BETWEEN_ACTIONS)
         return self._swap(chain=final_dest, to_eth=True)
 
     # ========================= User actions ========================= #
 
-    def swap_and_bridge(self) -> bool:
-        """Perform a sequence of swaps and bridges."""
+    def swap_and_bridge_steps(self) -> Flow:
+        """Perform a sequence of swaps and bridges, yielding while waiting on pauses and deliveries."""
 
         hops = random.randint(*settings.HOPS)
         self.current_chain = self._select_starting_chain()
@@ -155,12 +259,17 @@ class ActionHandler:
         if self.current_chain in ["base", "optimism"]:
             if not self._perform_initial_swap():
                 return False
-            random_sleep(*settings.SLEEP_BETWEEN_ACTIONS)
+            yield random_pause(*settings.SLEEP_BETWEEN_ACTIONS)
 
-        if hops > 1 and not self._perform_intermediate_bridges(hops):
+        if hops > 1 and not (yield from self._perform_intermediate_bridges_steps(hops)):
             return False
 
-        return self._perform_final_bridge_and_swap()
+        return (yield from self._perform_final_bridge_and_swap_steps())
+
+    def swap_and_bridge(self) -> bool:
+        """Perform a sequence of swaps and bridges."""
+
+        return run_steps(self.swap_and_bridge_steps())
 
     def swap_eth_to_ousdt(self):
         """Prompt user for chain and swap ETH to oUSDT."""
@@ -206,8 +315,8 @@ class ActionHandler:
             not chain and quit()
 
         if not dest_chain:
-            dest = select("Destination chain", choices=settings.AVAILABLE_CHAINS, style=q_style).ask()
-            not chain and quit()
+            dest_chain = select("Destination chain", choices=settings.AVAILABLE_CHAINS, style=q_style).ask()
+            not dest_chain and quit()
 
-        dapp = self._get_random_refuel(chain, dest_chain=dest)
-        dapp.refuel()
+        dapp, route = self._get_refuel(chain, dest_chain=dest_chain)
+        dapp.refuel(route=route)
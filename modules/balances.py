@@ -0,0 +1,30 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import settings
+from models.balances import BalanceSnapshot, ChainBalance
+from modules.config import ERC20_ABI, MULTICALL3, MULTICALL3_ABI, OUSDT
+from modules.contracts import contract_cache
+from modules.multicall import Multicall
+from modules.rpc import provider_pool
+
+_executor = ThreadPoolExecutor(max_workers=settings.SNAPSHOT_WORKERS, thread_name_prefix="snapshot")
+
+
+def fetch_chain_balance(address: str, chain_name: str) -> ChainBalance:
+    """Native and oUSDT balance on one chain in a single eth_call."""
+    w3 = provider_pool.get_web3(chain_name)
+    multicall = contract_cache.get(w3, MULTICALL3, MULTICALL3_ABI)
+    ousdt = contract_cache.get(w3, OUSDT, ERC20_ABI)
+
+    native, ousdt_balance = (
+        Multicall(w3).add(multicall.functions.getEthBalance(address), ousdt.functions.balanceOf(address)).execute()
+    )
+    return ChainBalance(native=native, ousdt=ousdt_balance)
+
+
+def take_snapshot(address: str, chains: list[str]) -> BalanceSnapshot:
+    """Balances on all `chains`, fetched in parallel."""
+    chains = list(dict.fromkeys(chains))
+    balances = _executor.map(lambda chain: fetch_chain_balance(address, chain), chains)
+
+    return BalanceSnapshot(address=address, chains=dict(zip(chains, balances)))
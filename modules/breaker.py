@@ -0,0 +1,97 @@
+import functools
+import threading
+import time
+from typing import Callable
+
+from modules.logger import logger
+
+
+class CircuitOpenError(Exception):
+    pass
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker for one external API, shared by every wallet in the process.
+
+    After `threshold` failures in a row the breaker opens and guarded calls fail fast with
+    CircuitOpenError. A background thread then runs `probe` every `probe_interval` seconds and
+    closes the breaker once it succeeds. Without a probe, one trial call is let through per interval.
+    """
+
+    def __init__(self, name: str, threshold: int = 3, probe_interval: float = 30, probe: Callable = None):
+        self.name = name
+        self.threshold = threshold
+        self.probe_interval = probe_interval
+        self.probe = probe
+
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def is_open(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return False
+
+            # Half-open: without a probe the next call is the trial
+            return self.probe is not None or time.monotonic() - self._opened_at < self.probe_interval
+
+    def guard(self, func: Callable) -> Callable:
+        """Decorator failing fast while open and counting the wrapped call's exceptions as failures.
+        The failure that opens the breaker is re-raised as CircuitOpenError too, so callers can fall back."""
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if self.is_open:
+                raise CircuitOpenError(f"{self.name} API is unavailable")
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception as err:
+                if self.record_failure(err):
+                    raise CircuitOpenError(f"{self.name} API is unavailable") from err
+                raise
+
+            self.record_success()
+            return result
+
+        return wrapper
+
+    def record_success(self) -> None:
+        with self._lock:
+            if self._opened_at is not None:
+                logger.info(f"{self.name} API recovered")
+
+            self._failures = 0
+            self._opened_at = None
+
+    def record_failure(self, err: Exception) -> bool:
+        """Count a failure, returns whether the breaker is now open."""
+        with self._lock:
+            self._failures += 1
+            if self._failures < self.threshold:
+                return False
+
+            opened = self._opened_at is None
+            self._opened_at = time.monotonic()
+
+        if opened:
+            logger.warning(f"{self.name} API failed {self.threshold} times in a row, routing around it: {err}")
+
+            if self.probe is not None:
+                threading.Thread(target=self._probe_until_healthy, daemon=True).start()
+
+        return True
+
+    def _probe_until_healthy(self) -> None:
+        while True:
+            time.sleep(self.probe_interval)
+
+            try:
+                self.probe()
+            except Exception:
+                continue
+
+            self.record_success()
+            return
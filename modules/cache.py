@@ -0,0 +1,91 @@
+import json
+import os
+import threading
+
+from web3.contract.contract import ContractFunction
+
+import settings
+from modules.contracts import get_codec
+
+# Argument-less getters whose result never changes for a deployed contract
+CONSTANT_FUNCTIONS = {"decimals", "symbol", "name", "localDomain", "mailbox", "wrappedToken"}
+
+
+class ConstantsCache:
+    """Disk-backed cache of immutable on-chain values keyed by (chain, contract, selector)."""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._data: dict = self._load()
+        self._new: dict = {}
+
+    def _load(self) -> dict:
+        if not os.path.exists(self.path):
+            return {}
+
+        try:
+            with open(self.path) as file:
+                return json.load(file)
+        except (OSError, ValueError):
+            return {}
+
+    def save(self) -> None:
+        """Write the values learned this run, merged over whatever is on disk now."""
+        with self._lock:
+            if not self._new:
+                return
+
+            self._data = {**self._load(), **self._new}
+            self._new = {}
+
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            tmp_path = f"{self.path}.{os.getpid()}.tmp"
+            with open(tmp_path, "w") as file:
+                json.dump(self._data, file, indent=2)
+            os.replace(tmp_path, self.path)
+
+    def export(self) -> dict:
+        """Values learned in this process and not saved yet, for a worker to hand back to the parent."""
+        with self._lock:
+            return dict(self._new)
+
+    def merge(self, entries: dict) -> None:
+        with self._lock:
+            self._data.update(entries)
+            self._new.update(entries)
+
+    @staticmethod
+    def is_constant(call: ContractFunction) -> bool:
+        return call.fn_name in CONSTANT_FUNCTIONS and not call.args
+
+    @staticmethod
+    def key(chain: str, call: ContractFunction) -> str:
+        selector = "0x" + get_codec(call.abi).selector.hex()
+        return f"{chain}:{call.address.lower()}:{selector}"
+
+    def get(self, chain: str, call: ContractFunction):
+        with self._lock:
+            return self._data.get(self.key(chain, call))
+
+    def set(self, chain: str, call: ContractFunction, value) -> None:
+        with self._lock:
+            key = self.key(chain, call)
+            self._data[key] = value
+            self._new[key] = value
+
+    def clear(self) -> int:
+        with self._lock:
+            count = len(self._data)
+            self._data = {}
+            self._new = {}
+            if os.path.exists(self.path):
+                os.remove(self.path)
+
+        return count
+
+
+constants_cache = ConstantsCache(settings.CONSTANTS_CACHE_PATH)
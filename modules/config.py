@@ -1,4 +1,5 @@
 import json
+from pathlib import Path
 
 import questionary
 
@@ -21,7 +22,10 @@ q_style = questionary.Style(
 
 ethereum = Network(
     name="ethereum",
-    rpc_url="https://rpc.ankr.com/eth",
+    rpc_urls=[
+        "https://rpc.ankr.com/eth",
+        "https://ethereum-rpc.publicnode.com",
+    ],
     explorer="https://etherscan.io",
     eip_1559=True,
     chain_id=1,
@@ -30,7 +34,10 @@ ethereum = Network(
 
 linea = Network(
     name="linea",
-    rpc_url="https://rpc.linea.build",
+    rpc_urls=[
+        "https://rpc.linea.build",
+        "https://linea-rpc.publicnode.com",
+    ],
     explorer="https://lineascan.build",
     eip_1559=True,
     chain_id=59144,
@@ -39,7 +46,10 @@ linea = Network(
 
 optimism = Network(
     name="optimism",
-    rpc_url="https://mainnet.optimism.io",
+    rpc_urls=[
+        "https://mainnet.optimism.io",
+        "https://optimism-rpc.publicnode.com",
+    ],
     explorer="https://optimistic.etherscan.io",
     eip_1559=True,
     chain_id=10,
@@ -48,7 +58,10 @@ optimism = Network(
 
 base = Network(
     name="base",
-    rpc_url="https://mainnet.base.org",
+    rpc_urls=[
+        "https://mainnet.base.org",
+        "https://base-rpc.publicnode.com",
+    ],
     explorer="https://basescan.org",
     eip_1559=True,
     chain_id=8453,
@@ -57,7 +70,10 @@ base = Network(
 
 soneium = Network(
     name="soneium",
-    rpc_url="https://rpc.soneium.org",
+    rpc_urls=[
+        "https://rpc.soneium.org",
+        "https://soneium.drpc.org",
+    ],
     explorer="https://soneium.blockscout.com",
     eip_1559=True,
     chain_id=1868,
@@ -66,7 +82,10 @@ soneium = Network(
 
 lisk = Network(
     name="lisk",
-    rpc_url="https://rpc.api.lisk.com",
+    rpc_urls=[
+        "https://rpc.api.lisk.com",
+        "https://lisk.drpc.org",
+    ],
     explorer="https://blockscout.lisk.com",
     eip_1559=True,
     chain_id=1135,
@@ -75,7 +94,10 @@ lisk = Network(
 
 unichain = Network(
     name="unichain",
-    rpc_url="https://mainnet.unichain.org",
+    rpc_urls=[
+        "https://mainnet.unichain.org",
+        "https://unichain-rpc.publicnode.com",
+    ],
     explorer="https://uniscan.xyz",
     eip_1559=True,
     chain_id=130,
@@ -84,7 +106,10 @@ unichain = Network(
 
 mode = Network(
     name="mode",
-    rpc_url="https://mainnet.mode.network",
+    rpc_urls=[
+        "https://mainnet.mode.network",
+        "https://mode.drpc.org",
+    ],
     explorer="https://explorer.mode.network",
     eip_1559=True,
     chain_id=34443,
@@ -93,7 +118,7 @@ mode = Network(
 
 superseed = Network(
     name="superseed",
-    rpc_url="https://mainnet.superseed.xyz",
+    rpc_urls=["https://mainnet.superseed.xyz"],
     explorer="https://explorer.superseed.xyz",
     eip_1559=True,
     chain_id=5330,
@@ -121,11 +146,8 @@ GASZIP_DIRECT_DEPOSIT_ADDRESS = "0x391E7C679d29bD940d63be94AD22A25d25b5A604"
 OUSDT = "0x1217BfE6c773EEC6cc4A38b5Dc45B92292B6E189"
 WETH = "0x4200000000000000000000000000000000000006"
 
-with open("abi/xERC20.json") as f:
-    XERC20_ABI = json.load(f)
-
-with open("abi/ERC20.json") as f:
-    ERC20_ABI = json.load(f)
+# Same address on every chain in CHAIN_MAPPING
+MULTICALL3 = "0xcA11bde05977b3631167028862bE2a173976CA11"
 
 
 # ========================= Velodrome Finance ========================= #
@@ -141,13 +163,6 @@ ROUTER = {
 }
 
 
-with open("abi/velodrome/QuoterV2.json") as f:
-    QUOTER_ABI = json.load(f)
-
-with open("abi/velodrome/UniversalRouter.json") as f:
-    ROUTER_ABI = json.load(f)
-
-
 # ============================= Hyperlane ============================= #
 
 
@@ -161,6 +176,9 @@ HYPERLANE_ROUTER = {
     "superseed": "0x5beADE696E12aBE2839FEfB41c7EE6DA1f074C55",
 }
 
+# keccak256("DispatchId(bytes32)"), emitted by the origin Mailbox for every dispatched message
+HYPERLANE_DISPATCH_ID_TOPIC = "0x788dbc1b7152732178210e7f4d9d010ef016f9eafbe66786bd7169f56e0c353a"
+
 HYPERLANE_DOMAINS = {
     "optimism": 10,
     "base": 8453,
@@ -170,3 +188,28 @@ HYPERLANE_DOMAINS = {
     "mode": 34443,
     "superseed": 5330,
 }
+
+#######################################################################
+#                                 ABIs                                #
+#######################################################################
+
+# Loaded on first access through the module __getattr__ below, so importing
+# config for a prompt style or a chain mapping doesn't parse every ABI file
+ABI_FILES = {
+    "XERC20_ABI": "abi/xERC20.json",
+    "ERC20_ABI": "abi/ERC20.json",
+    "MULTICALL3_ABI": "abi/Multicall3.json",
+    "QUOTER_ABI": "abi/velodrome/QuoterV2.json",
+    "ROUTER_ABI": "abi/velodrome/UniversalRouter.json",
+    "HYPERLANE_MAILBOX_ABI": "abi/hyperlane/Mailbox.json",
+}
+
+
+def __getattr__(name: str):
+    if name not in ABI_FILES:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+    abi = json.loads(Path(ABI_FILES[name]).read_text())
+    # Cached as a real module attribute, so every importer gets the same list object
+    globals()[name] = abi
+    return abi
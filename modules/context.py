@@ -0,0 +1,21 @@
+from modules.signer import derive_account
+from modules.wallet import Wallet
+
+
+class AccountContext:
+    """Long-lived per-account state handed to every step: one adapter (and its contracts) per protocol and chain."""
+
+    def __init__(self, account: dict):
+        self.account = account
+        self.address = derive_account(account["pk"]).address
+
+        self._adapters: dict[tuple, Wallet] = {}
+
+    def get(self, adapter: type[Wallet], chain: str, **kwargs) -> Wallet:
+        """Adapter for `chain`, built on first use and reused by later steps."""
+        key = (adapter, chain, tuple(sorted(kwargs.items())))
+
+        if key not in self._adapters:
+            self._adapters[key] = adapter(**self.account, chain=chain, **kwargs)
+
+        return self._adapters[key]
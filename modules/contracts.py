@@ -0,0 +1,97 @@
+import threading
+
+from eth_abi import decode, encode
+from eth_utils.abi import abi_to_signature, function_abi_to_4byte_selector, get_abi_input_types, get_abi_output_types
+from hexbytes import HexBytes
+from web3 import Web3
+from web3.contract import Contract
+from web3.contract.contract import ContractFunction
+
+from modules.config import ERC20_ABI, ROUTER_ABI, XERC20_ABI
+
+# Functions on the hot path of every swap/bridge, their codecs are built at import
+HOT_FUNCTIONS = [
+    (ERC20_ABI, "balanceOf"),
+    (ERC20_ABI, "allowance"),
+    (ERC20_ABI, "approve"),
+    (XERC20_ABI, "transferRemote"),
+    (ROUTER_ABI, "execute"),
+]
+
+
+def _normalize(abi_type: str, value):
+    """Hex strings for bytes arguments, as web3 accepts them."""
+    if abi_type.endswith("[]"):
+        return [_normalize(abi_type[:-2], item) for item in value]
+    if abi_type.startswith("bytes") and isinstance(value, str):
+        return HexBytes(value)
+    return value
+
+
+class FunctionCodec:
+    """Precomputed selector and argument/result types for one ABI function."""
+
+    def __init__(self, abi_element: dict):
+        self.signature = abi_to_signature(abi_element)
+        self.selector = function_abi_to_4byte_selector(abi_element)
+        self.input_types = get_abi_input_types(abi_element)
+        self.output_types = get_abi_output_types(abi_element)
+
+    def encode(self, args) -> str:
+        values = [_normalize(abi_type, value) for abi_type, value in zip(self.input_types, args)]
+        return "0x" + (self.selector + encode(self.input_types, values)).hex()
+
+    def decode(self, data: bytes):
+        values = decode(self.output_types, data)
+        return values[0] if len(values) == 1 else values
+
+
+_codecs: dict[str, FunctionCodec] = {}
+
+
+def get_codec(abi_element: dict) -> FunctionCodec:
+    signature = abi_to_signature(abi_element)
+
+    if signature not in _codecs:
+        _codecs[signature] = FunctionCodec(abi_element)
+
+    return _codecs[signature]
+
+
+def encode_call(call: ContractFunction) -> str:
+    """Calldata for a bound contract call, skipping web3's per-call ABI resolution."""
+    if call.kwargs:
+        return call._encode_transaction_data()
+
+    return get_codec(call.abi).encode(call.args)
+
+
+def decode_result(call: ContractFunction, data: bytes):
+    return get_codec(call.abi).decode(data)
+
+
+for abi, name in HOT_FUNCTIONS:
+    for element in abi:
+        if element.get("type") == "function" and element.get("name") == name:
+            get_codec(element)
+
+
+class ContractCache:
+    """Contract instances keyed by (chain, address, ABI), so each ABI is parsed once per contract."""
+
+    def __init__(self):
+        self._contracts: dict[tuple[int, str, int], Contract] = {}
+        self._lock = threading.Lock()
+
+    def get(self, w3: Web3, address: str, abi: list) -> Contract:
+        # One shared Web3 per chain and module-level ABI constants make both identities stable keys
+        key = (id(w3), address.lower(), id(abi))
+
+        with self._lock:
+            if key not in self._contracts:
+                self._contracts[key] = w3.eth.contract(address=w3.to_checksum_address(address), abi=abi)
+
+            return self._contracts[key]
+
+
+contract_cache = ContractCache()
@@ -0,0 +1,110 @@
+import threading
+import time
+from urllib.parse import urlparse
+
+from modules.logger import logger
+
+# Weight of the newest sample in the rolling latency and error rate
+EWMA_ALPHA = 0.2
+# Seconds an endpoint sits out after consecutive failures: 2, 4, 8, ... up to the cap
+COOLDOWN_BASE = 2
+COOLDOWN_MAX = 60
+
+
+class Endpoint:
+    """Rolling latency and error rate of one RPC URL."""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.host = urlparse(url).netloc
+        self.latency: float | None = None  # seconds, None until the first response
+        self.error_rate = 0.0
+        self.failures = 0  # consecutive
+        self.cooldown_until = 0.0
+
+    @property
+    def healthy(self) -> bool:
+        return time.monotonic() >= self.cooldown_until
+
+    @property
+    def score(self) -> float:
+        """Lower is better. Untried endpoints score 0, so each gets measured early on, unless they never answered."""
+        if self.latency is None:
+            return COOLDOWN_MAX if self.failures or self.error_rate else 0
+
+        return self.latency * (1 + 4 * self.error_rate)
+
+    def __repr__(self):
+        return f"Endpoint({self.host})"
+
+
+class EndpointSet:
+    """The RPC URLs of one chain, ranked by rolling latency and health.
+
+    Reads go to the best-scoring healthy endpoint. Writes and nonce reads stick to one pinned
+    endpoint, so a nonce is read where the tx using it is broadcast; the pin only moves on failure.
+    """
+
+    def __init__(self, chain_name: str, urls: list[str]):
+        if not urls:
+            raise ValueError(f"No RPC endpoints configured for {chain_name}")
+
+        self.chain_name = chain_name
+        self.endpoints = [Endpoint(url) for url in urls]
+        self._pinned: Endpoint | None = None
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.endpoints)
+
+    def ranked(self) -> list[Endpoint]:
+        """Healthy endpoints fastest first, then the ones cooling down as a last resort."""
+        with self._lock:
+            healthy = sorted((e for e in self.endpoints if e.healthy), key=lambda e: e.score)
+            cooling = sorted((e for e in self.endpoints if not e.healthy), key=lambda e: e.cooldown_until)
+
+        return healthy + cooling
+
+    def pinned(self) -> list[Endpoint]:
+        """The pinned endpoint first, then the others in rank order as fallbacks."""
+        ranked = self.ranked()
+
+        with self._lock:
+            if self._pinned is None or not self._pinned.healthy:
+                self._pinned = ranked[0]
+            pinned = self._pinned
+
+        return [pinned, *(endpoint for endpoint in ranked if endpoint is not pinned)]
+
+    def record_latency(self, endpoint: Endpoint, seconds: float) -> None:
+        """A latency sample without an outcome, e.g. a read abandoned for a hedge."""
+        with self._lock:
+            self._add_latency(endpoint, seconds)
+
+    @staticmethod
+    def _add_latency(endpoint: Endpoint, seconds: float) -> None:
+        endpoint.latency = seconds if endpoint.latency is None else (
+            EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * endpoint.latency
+        )
+
+    def record_success(self, endpoint: Endpoint, seconds: float) -> None:
+        with self._lock:
+            self._add_latency(endpoint, seconds)
+            endpoint.error_rate *= 1 - EWMA_ALPHA
+            endpoint.failures = 0
+            endpoint.cooldown_until = 0.0
+
+    def record_failure(self, endpoint: Endpoint, err: Exception) -> None:
+        with self._lock:
+            endpoint.error_rate = EWMA_ALPHA + (1 - EWMA_ALPHA) * endpoint.error_rate
+            endpoint.failures += 1
+
+            if len(self.endpoints) > 1:
+                cooldown = min(COOLDOWN_MAX, COOLDOWN_BASE**endpoint.failures)
+                endpoint.cooldown_until = time.monotonic() + cooldown
+
+            if self._pinned is endpoint:
+                self._pinned = None
+
+        if len(self.endpoints) > 1:
+            logger.warning(f"{self.chain_name.title()} RPC {endpoint.host} failed, sitting out {cooldown}s: {err}")
@@ -0,0 +1,120 @@
+import threading
+import time
+
+from web3.exceptions import Web3RPCError
+from web3.types import RPCEndpoint
+
+import settings
+from models.network import Network
+from modules.logger import logger
+from modules.rpc import is_transient, provider_pool
+
+# Priority fee percentile of the latest block used by each strategy
+FEE_STRATEGIES = {"slow": 10, "normal": 50, "fast": 90}
+
+# JSON-RPC "method not found", and how nodes word it when they answer with another code
+METHOD_NOT_FOUND = -32601
+UNSUPPORTED_MESSAGES = ("method not found", "not supported", "unsupported", "does not exist")
+
+
+def _is_unsupported(err: Exception) -> bool:
+    """Whether the node rejected the method itself, as opposed to a transient failure."""
+    if not isinstance(err, Web3RPCError):
+        return False
+
+    error = (err.rpc_response or {}).get("error") or {}
+    if isinstance(error, dict) and error.get("code") == METHOD_NOT_FOUND:
+        return True
+
+    message = error.get("message", "") if isinstance(error, dict) else str(error)
+    return any(text in (message or err.message).lower() for text in UNSUPPORTED_MESSAGES)
+
+
+class FeeOracle:
+    """Per-chain fee data shared by every wallet in the process, cached for `ttl` seconds (~one block)."""
+
+    def __init__(self, ttl: float = 2, strategy: str = "normal", use_fee_history: bool = True):
+        if strategy not in FEE_STRATEGIES:
+            raise ValueError(f"Unknown fee strategy: {strategy}, expected one of {list(FEE_STRATEGIES)}")
+
+        self.ttl = ttl
+        self.percentile = FEE_STRATEGIES[strategy]
+        self.use_fee_history = use_fee_history
+
+        self._fees: dict[str, tuple[float, dict]] = {}
+        self._locks: dict[str, threading.Lock] = {}
+        self._registry_lock = threading.Lock()
+        self._no_fee_history: set[str] = set()
+        self._no_batch: set[str] = set()
+
+    def _lock(self, chain_name: str) -> threading.Lock:
+        with self._registry_lock:
+            return self._locks.setdefault(chain_name, threading.Lock())
+
+    def _from_fee_history(self, chain: Network) -> dict:
+        w3 = provider_pool.get_web3(chain.name)
+        history = w3.eth.fee_history(1, "latest", [self.percentile])
+
+        # baseFeePerGas holds one extra entry: the base fee of the next block
+        base_fee = history["baseFeePerGas"][-1]
+        max_priority_fee = history["reward"][0][0]
+
+        return {"maxFeePerGas": base_fee + max_priority_fee, "maxPriorityFeePerGas": max_priority_fee}
+
+    def _from_latest_block(self, chain: Network) -> dict:
+        w3 = provider_pool.get_web3(chain.name)
+        batch = [
+            (RPCEndpoint("eth_getBlockByNumber"), ["latest", False]),
+            (RPCEndpoint("eth_maxPriorityFeePerGas"), []),
+        ]
+
+        if chain.name not in self._no_batch:
+            try:
+                responses = w3.provider.make_batch_request(batch)
+                latest_block, max_priority_fee = [response["result"] for response in responses]
+                base_fee, max_priority_fee = int(latest_block["baseFeePerGas"], 16), int(max_priority_fee, 16)
+
+                return {"maxFeePerGas": base_fee + max_priority_fee, "maxPriorityFeePerGas": max_priority_fee}
+            except Exception as err:
+                # A rejected batch stays rejected, a dropped connection doesn't
+                if not is_transient(err):
+                    logger.warning(f"{chain.name.title()} RPC rejects batches, reading fees one call at a time: {err}")
+                    self._no_batch.add(chain.name)
+
+        base_fee, max_priority_fee = w3.eth.get_block("latest")["baseFeePerGas"], w3.eth.max_priority_fee
+
+        return {"maxFeePerGas": base_fee + max_priority_fee, "maxPriorityFeePerGas": max_priority_fee}
+
+    def _fetch(self, chain: Network) -> dict:
+        if not chain.eip_1559:
+            return {"gasPrice": provider_pool.get_web3(chain.name).eth.gas_price}
+
+        if self.use_fee_history and chain.name not in self._no_fee_history:
+            try:
+                return self._from_fee_history(chain)
+            except Exception as err:
+                if _is_unsupported(err):
+                    logger.warning(f"{chain.name.title()} eth_feeHistory unsupported, using latest block: {err}")
+                    self._no_fee_history.add(chain.name)
+                else:
+                    logger.warning(f"{chain.name.title()} eth_feeHistory failed, using latest block this time: {err}")
+
+        return self._from_latest_block(chain)
+
+    def get_fees(self, chain: Network) -> dict:
+        """Fee fields ready to merge into a tx: maxFeePerGas/maxPriorityFeePerGas, or gasPrice for legacy chains."""
+        with self._lock(chain.name):
+            fetched_at, fees = self._fees.get(chain.name, (0, None))
+
+            if fees is None or time.monotonic() - fetched_at > self.ttl:
+                fees = self._fetch(chain)
+                self._fees[chain.name] = (time.monotonic(), fees)
+
+            return dict(fees)
+
+
+fee_oracle = FeeOracle(
+    ttl=settings.FEE_CACHE_TTL,
+    strategy=settings.FEE_STRATEGY,
+    use_fee_history=settings.USE_FEE_HISTORY,
+)
@@ -1,16 +1,22 @@
 import random
+import time
 
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
 
 import settings
 from models.network import Network
+from models.route import RouteQuote
 from modules.config import GASZIP_DIRECT_DEPOSIT_ADDRESS
-from modules.http import HttpClient
+from modules.http import http_clients
 from modules.logger import logger
-from modules.utils import get_token_price, wei
+from modules.routing import fill_times
+from modules.utils import ether, get_token_price, wei
 from modules.wallet import Wallet
 
 
+DEPOSIT_GAS = 30_000  # plain ETH transfer with the destination chain in calldata
+
+
 class PendingStatus(Exception):
     pass
 
@@ -21,7 +27,7 @@ class GasZip(Wallet):
     def __init__(self, pk, _id, proxy, chain, dest_chain):
         super().__init__(pk, _id, chain)
         self.label += "Gas.zip |"
-        self.http = HttpClient(self.BASE_URL, proxy)
+        self.http = http_clients.get(self.BASE_URL, proxy)
 
         self.src_chain: Network = self.chain
         self.dest_chain: str = dest_chain
@@ -30,14 +36,14 @@ class GasZip(Wallet):
     def amount(self) -> float:
         return random.uniform(*settings.REFUEL_AMOUNT)
 
-    def _validate_amount(self) -> int:
+    def _validate_amount(self, amount: int) -> int:
         eth_price = get_token_price("ETH")
-        amount_usd = self.amount * eth_price
+        amount_usd = float(ether(amount)) * eth_price
 
         if amount_usd < 0.26 or amount_usd > 50.00:
             raise ValueError("Refuel amount falls outside Gas.zip limits: $0.25 - $50.00")
 
-        return wei(self.amount)
+        return amount
 
     def _quote(self, amount: int, dest_chain_id: int) -> dict:
         url = f"/quotes/{self.chain.chain_id}/{amount}/{dest_chain_id}"
@@ -45,6 +51,20 @@ class GasZip(Wallet):
 
         return resp.json()
 
+    def quote_refuel(self, amount: int) -> RouteQuote:
+        """Quote a refuel of `amount` wei for best-provider selection."""
+        to_chain = self.get_chain_by_name(self.dest_chain)
+        quote = self._quote(self._validate_amount(amount), to_chain.chain_id)
+        dest_quote = quote["quotes"][0]
+
+        return RouteQuote(
+            amount_in=amount,
+            amount_out=int(dest_quote["expected"]),
+            gas=DEPOSIT_GAS,
+            eta=dest_quote.get("speed"),
+            data=quote,
+        )
+
     def _verify_deposit(self, tx_hash: str) -> bool:
         endpoint = f"/deposit/0x{tx_hash}"
         logger.info(f"{self.label} {self.http.base_url}{endpoint}")
@@ -72,13 +92,13 @@ class GasZip(Wallet):
         else:
             raise PendingStatus("Response does not contain 'deposit' or 'status'")
 
-    def refuel(self):
+    def refuel(self, route: RouteQuote = None):
         if self.src_chain is None or self.dest_chain is None:
             quit()
 
-        amount = self._validate_amount()
+        amount = route.amount_in if route else self._validate_amount(wei(self.amount))
         to_chain = self.get_chain_by_name(self.dest_chain)
-        quote = self._quote(amount, to_chain.chain_id)
+        quote = route.data if route else self._quote(amount, to_chain.chain_id)
 
         tx = self.get_tx_data(
             value=amount,
@@ -87,10 +107,12 @@ class GasZip(Wallet):
             get_gas=True,
         )
 
+        started = time.monotonic()
         self._verify_deposit(
             self.send_tx(
                 tx,
-                tx_label=f"{self.label} Refuel {self.amount:.6f} ETH {self.chain.name.title()} -> {to_chain.name.title()}",
+                tx_label=f"{self.label} Refuel {ether(amount):.6f} ETH {self.chain.name.title()} -> {to_chain.name.title()}",
                 gas_multiplier=1.2,
             )
         )
+        fill_times.record(self, time.monotonic() - started)
@@ -1,33 +1,83 @@
+import threading
+import time
+from functools import lru_cache
+from urllib.parse import urlparse
+
 import requests
 from fake_useragent import UserAgent
 from requests.adapters import HTTPAdapter
 from requests.exceptions import HTTPError
 from urllib3.util.retry import Retry
 
+import settings
+from modules import ratelimit
+from modules.metrics import endpoint_name, metrics
+
+
+@lru_cache(maxsize=1)
+def _user_agents() -> UserAgent:
+    """Loading the user agent database is the slow part of building a client, do it once per process."""
+    return UserAgent()
+
 
 class HttpClient(requests.Session):
-    def __init__(self, base_url="", proxy=None):
+    # Shared by every client of the same API, caps in-flight requests per base URL
+    _semaphores: dict[str, threading.BoundedSemaphore] = {}
+    _semaphores_lock = threading.Lock()
+
+    def __init__(self, base_url="", proxy=None, pool_size: int = 10):
         super().__init__()
         self.proxy = proxy
         self.base_url = base_url
-        self.headers.update({"User-Agent": UserAgent().random})
+        self.headers.update({"User-Agent": _user_agents().random})
 
         if proxy:
             self.proxies.update({"http": proxy, "https": proxy})
 
+        # Connection errors only, throttling statuses are retried through the rate limiter in _request
         retry_strategy = Retry(
-            total=5,
-            status_forcelist=[502, 503, 504],
-            backoff_factor=1,
+            total=3,
+            backoff_factor=0.5,
+            respect_retry_after_header=False,
         )
 
-        adapter = HTTPAdapter(max_retries=retry_strategy)
+        adapter = HTTPAdapter(max_retries=retry_strategy, pool_maxsize=pool_size)
         self.mount("https://", adapter)
         self.mount("http://", adapter)
 
+        with self._semaphores_lock:
+            self.semaphore = self._semaphores.setdefault(
+                base_url, threading.BoundedSemaphore(settings.API_CONCURRENCY)
+            )
+
     def _request(self, method, endpoint, *args, **kwargs):
         url = f"{self.base_url}{endpoint}"
-        resp = super().request(method, url, *args, **kwargs)
+        target = f"api:{urlparse(url).netloc}"
+
+        for _ in range(settings.THROTTLE_RETRIES + 1):
+            ratelimit.acquire(target)
+
+            with self.semaphore:
+                started = time.perf_counter()
+                resp = None
+
+                try:
+                    resp = super().request(method, url, *args, **kwargs)
+                finally:
+                    metrics.record(
+                        target,
+                        endpoint_name(method, urlparse(url).path),
+                        time.perf_counter() - started,
+                        sent=len(resp.request.body or b"") if resp is not None else 0,
+                        received=len(resp.content) if resp is not None else 0,
+                        error=resp is None or resp.status_code >= 400,
+                    )
+
+            if resp.status_code not in ratelimit.THROTTLE_STATUSES:
+                break
+
+            # Throttled: queue up again behind the (now slower) limiter rather than failing
+            ratelimit.report(target, resp.status_code, ratelimit.retry_after(resp.headers))
 
         if resp.status_code not in [200, 201, 500]:
             raise HTTPError(f"{resp.status_code} {resp.text}")
@@ -39,3 +89,30 @@ class HttpClient(requests.Session):
 
     def post(self, endpoint, *args, **kwargs):
         return self._request("POST", endpoint, *args, **kwargs)
+
+
+class ClientPool:
+    """Process-wide HttpClients keyed by (base URL, proxy), so protocol objects share warm connections."""
+
+    def __init__(self, pool_size: int = 10):
+        self.pool_size = pool_size
+        self._clients: dict[tuple[str, str | None], HttpClient] = {}
+        self._lock = threading.Lock()
+
+    def get(self, base_url: str, proxy: str = None) -> HttpClient:
+        key = (base_url, proxy)
+
+        with self._lock:
+            if key not in self._clients:
+                self._clients[key] = HttpClient(base_url, proxy, pool_size=self.pool_size)
+
+            return self._clients[key]
+
+    def close(self) -> None:
+        with self._lock:
+            for client in self._clients.values():
+                client.close()
+            self._clients.clear()
+
+
+http_clients = ClientPool(pool_size=settings.HTTP_POOL_SIZE)
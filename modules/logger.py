@@ -1,19 +1,35 @@
+import threading
 from datetime import datetime
+from multiprocessing import parent_process
 from sys import stderr
 
 from loguru import logger
 
 LOG_OUTPUT = f"./logs/{datetime.today().strftime('%Y-%m-%d')}.log"
 LOG_ROTATION = "50 MB"
+LOG_FORMAT = "<white>{time:HH:mm:ss}</white> | <level>{message}</level>"
 
 logger.remove()
-logger.add(
-    stderr,
-    format="<white>{time:HH:mm:ss}</white> | <level>{message}</level>",
-)
-
-logger.add(
-    sink=LOG_OUTPUT,
-    rotation=LOG_ROTATION,
-    format="<white>{time:HH:mm:ss}</white> | <level>{message}</level>",
-)
+logger.add(stderr, format=LOG_FORMAT)
+
+# Only the main process owns the file: sharded workers forward their records to it (see forward_to)
+if parent_process() is None:
+    logger.add(sink=LOG_OUTPUT, rotation=LOG_ROTATION, format=LOG_FORMAT)
+
+
+def forward_to(queue) -> None:
+    """In a worker process: send every record to the parent's queue instead of the console."""
+    logger.remove()
+    logger.add(lambda message: queue.put((message.record["level"].name, message.record["message"])), format="{message}")
+
+
+def drain(queue) -> threading.Thread:
+    """In the parent: log the records workers forward until a None arrives."""
+
+    def run():
+        for level, message in iter(queue.get, None):
+            logger.log(level, message)
+
+    thread = threading.Thread(target=run, daemon=True)
+    thread.start()
+    return thread
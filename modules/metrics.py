@@ -0,0 +1,155 @@
+import json
+import os
+import re
+import threading
+from datetime import datetime
+
+import settings
+from modules.logger import logger
+
+# Upper bounds of the latency histogram buckets in milliseconds, the last bucket is open-ended
+LATENCY_BUCKETS_MS = (5, 10, 25, 50, 100, 250, 500, 1000, 2500, 5000, 10000)
+
+# Path segments that are ids (tx hashes, amounts, chain ids) rather than part of the endpoint
+_ID_SEGMENT = re.compile(r"^(0x[0-9a-fA-F]+|\d+)$")
+
+
+def endpoint_name(method: str, path: str) -> str:
+    """"GET /deposit/0xabc..." -> "GET /deposit/:id", so one endpoint is one series."""
+    segments = [":id" if _ID_SEGMENT.match(segment) else segment for segment in path.split("?")[0].split("/")]
+    return f"{method} {'/'.join(segments)}"
+
+
+class Series:
+    """Count, errors, sizes and a latency histogram for one (target, method)."""
+
+    def __init__(self):
+        self.count = 0
+        self.errors = 0
+        self.total_seconds = 0.0
+        self.max_seconds = 0.0
+        self.bytes_sent = 0
+        self.bytes_received = 0
+        self.buckets = [0] * (len(LATENCY_BUCKETS_MS) + 1)
+
+    def add(self, seconds: float, sent: int, received: int, error: bool) -> None:
+        self.count += 1
+        self.errors += error
+        self.total_seconds += seconds
+        self.max_seconds = max(self.max_seconds, seconds)
+        self.bytes_sent += sent
+        self.bytes_received += received
+
+        milliseconds = seconds * 1000
+        index = next((i for i, bound in enumerate(LATENCY_BUCKETS_MS) if milliseconds <= bound), -1)
+        self.buckets[index] += 1
+
+    def percentile(self, fraction: float) -> float:
+        """Upper bound (ms) of the bucket holding the given fraction of requests."""
+        target = fraction * self.count
+        seen = 0
+
+        for bound, count in zip(LATENCY_BUCKETS_MS, self.buckets):
+            seen += count
+            if seen >= target:
+                return bound
+
+        return self.max_seconds * 1000
+
+    def merge(self, data: dict) -> None:
+        self.count += data["count"]
+        self.errors += data["errors"]
+        self.total_seconds += data["total_seconds"]
+        self.max_seconds = max(self.max_seconds, data["max_seconds"])
+        self.bytes_sent += data["bytes_sent"]
+        self.bytes_received += data["bytes_received"]
+        self.buckets = [a + b for a, b in zip(self.buckets, data["buckets"])]
+
+    def to_dict(self) -> dict:
+        return {
+            "count": self.count,
+            "errors": self.errors,
+            "error_rate": self.errors / self.count if self.count else 0,
+            "total_seconds": self.total_seconds,
+            "mean_ms": self.total_seconds * 1000 / self.count if self.count else 0,
+            "p50_ms": self.percentile(0.5),
+            "p95_ms": self.percentile(0.95),
+            "max_seconds": self.max_seconds,
+            "bytes_sent": self.bytes_sent,
+            "bytes_received": self.bytes_received,
+            "buckets": self.buckets,
+        }
+
+
+class Metrics:
+    """Process-wide request statistics keyed by target ("rpc:base", "api:api.odos.xyz") and method/endpoint."""
+
+    def __init__(self, enabled: bool = True):
+        self.enabled = enabled
+        self._series: dict[tuple[str, str], Series] = {}
+        self._lock = threading.Lock()
+
+    def record(self, target: str, name: str, seconds: float, sent: int = 0, received: int = 0, error=False) -> None:
+        if not self.enabled:
+            return
+
+        with self._lock:
+            self._series.setdefault((target, name), Series()).add(seconds, sent, received, bool(error))
+
+    def export(self) -> list[dict]:
+        with self._lock:
+            return [
+                {"target": target, "name": name, **series.to_dict()}
+                for (target, name), series in sorted(self._series.items())
+            ]
+
+    def merge(self, exported: list[dict]) -> None:
+        """Fold in another process's `export()`."""
+        with self._lock:
+            for data in exported:
+                self._series.setdefault((data["target"], data["name"]), Series()).merge(data)
+
+    def summary(self) -> str:
+        rows = self.export()
+        header = (
+            f"{'target':<22} {'method':<40} {'count':>6} {'err %':>6} {'mean ms':>8} "
+            f"{'p50 ms':>7} {'p95 ms':>7} {'max ms':>8} {'KiB':>8}"
+        )
+        lines = [header, "-" * len(header)]
+
+        for row in sorted(rows, key=lambda row: row["total_seconds"], reverse=True):
+            lines.append(
+                f"{row['target']:<22} {row['name'][:40]:<40} {row['count']:>6} {row['error_rate'] * 100:>6.1f} "
+                f"{row['mean_ms']:>8.1f} {row['p50_ms']:>7.0f} {row['p95_ms']:>7.0f} "
+                f"{row['max_seconds'] * 1000:>8.0f} {(row['bytes_sent'] + row['bytes_received']) / 1024:>8.1f}"
+            )
+
+        return "\n".join(lines)
+
+    def dump(self, path: str) -> None:
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+
+        with open(path, "w") as f:
+            json.dump(
+                {
+                    "generated_at": datetime.now().isoformat(timespec="seconds"),
+                    "latency_buckets_ms": LATENCY_BUCKETS_MS,
+                    "series": self.export(),
+                },
+                f,
+                indent=2,
+            )
+
+    def report(self, path: str = None) -> None:
+        """Log the summary table and write the JSON dump, if anything was recorded."""
+        if not self.enabled or not self._series:
+            return
+
+        logger.info(f"Request metrics:\n{self.summary()}")
+
+        if path:
+            self.dump(path)
+            logger.info(f"Request metrics written to {path}")
+
+
+metrics = Metrics(enabled=settings.COLLECT_METRICS)
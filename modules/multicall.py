@@ -0,0 +1,44 @@
+from web3 import Web3
+from web3.contract.contract import ContractFunction
+
+from modules.config import MULTICALL3, MULTICALL3_ABI
+from modules.contracts import contract_cache, decode_result, encode_call
+
+
+class MulticallError(Exception):
+    pass
+
+
+class Multicall:
+    """Aggregates view calls into a single eth_call through Multicall3."""
+
+    def __init__(self, w3: Web3):
+        self.w3 = w3
+        self.contract = contract_cache.get(w3, MULTICALL3, MULTICALL3_ABI)
+        self.calls: list[ContractFunction] = []
+
+    def add(self, *calls: ContractFunction) -> "Multicall":
+        self.calls.extend(calls)
+        return self
+
+    def _decode(self, call: ContractFunction, success: bool, data: bytes, allow_failure: bool):
+        if not success:
+            error = MulticallError(f"{call.fn_name} reverted on {call.address}")
+            if allow_failure:
+                return error
+            raise error
+
+        return decode_result(call, data)
+
+    def execute(self, allow_failure: bool = False) -> list:
+        """Decoded results in call order. With `allow_failure`, a reverted call's slot holds
+        its MulticallError instead of failing the whole batch."""
+        if not self.calls:
+            return []
+
+        payload = [(call.address, True, encode_call(call)) for call in self.calls]
+        results = self.contract.functions.aggregate3(payload).call()
+
+        return [
+            self._decode(call, success, data, allow_failure) for call, (success, data) in zip(self.calls, results)
+        ]
@@ -0,0 +1,48 @@
+import threading
+from collections import defaultdict
+
+from web3 import Web3
+
+
+class NonceManager:
+    """Hands out nonces per (address, chain) from a single pending-nonce read."""
+
+    def __init__(self):
+        self._nonces: dict[tuple[str, str], int] = {}
+        self._locks: defaultdict[tuple[str, str], threading.Lock] = defaultdict(threading.Lock)
+        self._registry_lock = threading.Lock()
+
+    def _lock(self, key: tuple[str, str]) -> threading.Lock:
+        with self._registry_lock:
+            return self._locks[key]
+
+    def _sync(self, w3: Web3, key: tuple[str, str]) -> int:
+        if key not in self._nonces:
+            self._nonces[key] = w3.eth.get_transaction_count(key[0], "pending")
+        return self._nonces[key]
+
+    def next_nonce(self, w3: Web3, address: str, chain: str) -> int:
+        key = (address, chain)
+
+        with self._lock(key):
+            nonce = self._sync(w3, key)
+            self._nonces[key] = nonce + 1
+
+            return nonce
+
+    def peek(self, w3: Web3, address: str, chain: str) -> int:
+        """Nonce the next transaction will use, i.e. the pending tx count."""
+        key = (address, chain)
+
+        with self._lock(key):
+            return self._sync(w3, key)
+
+    def reset(self, address: str, chain: str) -> None:
+        """Forget the local counter so the next nonce is re-read from the node."""
+        key = (address, chain)
+
+        with self._lock(key):
+            self._nonces.pop(key, None)
+
+
+nonce_manager = NonceManager()
@@ -9,8 +9,10 @@ from tenacity import (
 from web3 import constants
 
 import settings
+from models.route import RouteQuote
+from modules.breaker import CircuitBreaker
 from modules.config import OUSDT
-from modules.http import HttpClient
+from modules.http import http_clients
 from modules.utils import ether, wei
 from modules.wallet import Wallet
 
@@ -19,22 +21,40 @@ class OdosQuoteError(Exception):
     pass
 
 
+def _probe() -> None:
+    resp = http_clients.get(Odos.BASE_URL).get("/info/chains")
+
+    if resp.status_code != 200:
+        raise Exception(f"Odos health probe failed: {resp.status_code}")
+
+
+# Shared by every wallet: once Odos keeps failing, swaps go to Velodrome until a probe succeeds
+odos_breaker = CircuitBreaker(
+    "Odos",
+    threshold=settings.BREAKER_FAILURE_THRESHOLD,
+    probe_interval=settings.BREAKER_PROBE_INTERVAL,
+    probe=_probe,
+)
+
+
 class Odos(Wallet):
     BASE_URL = "https://api.odos.xyz"
 
     def __init__(self, pk, _id, proxy, chain):
         super().__init__(pk, _id, chain)
         self.label += "ODOS |"
-        self.http = HttpClient(self.BASE_URL, proxy)
+        self.http = http_clients.get(self.BASE_URL, proxy)
 
     @retry(
         stop=stop_after_attempt(10),
         wait=wait_exponential(multiplier=1, max=60),
+        # Once the breaker opens this raises CircuitOpenError instead, which ends the retries
         retry=retry_if_exception_type(OdosQuoteError),
     )
+    @odos_breaker.guard
     def _quote(self, token_in, token_out, amount_in):
         payload = {
-            "chainId": self.w3.eth.chain_id,
+            "chainId": self.chain.chain_id,
             "inputTokens": [
                 {
                     "tokenAddress": token_in,
@@ -66,6 +86,19 @@ class Odos(Wallet):
         else:
             raise Exception(f"Failed to fetch quote: {resp.status_code} {resp.text}")
 
+    def quote_swap(self, amount_in: int, to_eth: bool = False) -> RouteQuote:
+        """Quote ETH -> oUSDT, or oUSDT -> ETH with `to_eth`, for best-route selection."""
+        token_in, token_out = (OUSDT, constants.ADDRESS_ZERO) if to_eth else (constants.ADDRESS_ZERO, OUSDT)
+        quote = self._quote(token_in, token_out, amount_in)
+
+        return RouteQuote(
+            amount_in=amount_in,
+            amount_out=int(quote["outAmounts"][0]),
+            gas=int(quote["gasEstimate"]),
+            data=quote,
+        )
+
+    @odos_breaker.guard
     def _assemble(self, path_id):
         payload = {
             "userAddr": self.address,
@@ -80,10 +113,10 @@ class Odos(Wallet):
 
         return resp.json()
 
-    def swap_eth(self, token_in: str = constants.ADDRESS_ZERO, token_out: str = OUSDT):
-        amount_in = wei(random.uniform(*settings.SWAP_AMOUNT))
+    def swap_eth(self, token_in: str = constants.ADDRESS_ZERO, token_out: str = OUSDT, route: RouteQuote = None):
+        amount_in = route.amount_in if route else wei(random.uniform(*settings.SWAP_AMOUNT))
 
-        quote = self._quote(token_in, token_out, amount_in)
+        quote = route.data if route else self._quote(token_in, token_out, amount_in)
         transaction = self._assemble(quote["pathId"])["transaction"]
 
         tx = self.get_tx_data(
@@ -99,11 +132,11 @@ class Odos(Wallet):
             gas_multiplier=1.2,
         )
 
-    def swap_erc20(self, token_in: str = OUSDT, token_out: str = constants.ADDRESS_ZERO):
+    def swap_erc20(self, token_in: str = OUSDT, token_out: str = constants.ADDRESS_ZERO, route: RouteQuote = None):
         balance, decimals, symbol = self.get_token_info(token_in)
-        amount_in = int(balance * random.uniform(*settings.SWAP_BACK_PERCENTAGE))
+        amount_in = route.amount_in if route else int(balance * random.uniform(*settings.SWAP_BACK_PERCENTAGE))
 
-        quote = self._quote(token_in, token_out, amount_in)
+        quote = route.data if route else self._quote(token_in, token_out, amount_in)
         transaction = self._assemble(quote["pathId"])["transaction"]
 
         self.approve(token_in, transaction["to"], amount_in)
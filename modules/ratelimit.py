@@ -0,0 +1,139 @@
+import threading
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from multiprocessing.managers import BaseManager
+
+import settings
+
+
+# Statuses meaning "slow down": the host is throttling us or overloaded
+THROTTLE_STATUSES = {429, 502, 503, 504}
+# Never throttle a key below this fraction of its configured rate
+MIN_RATE_FRACTION = 0.1
+# Fraction of the configured rate a throttled key regains per second without further throttling
+RECOVERY_PER_SECOND = 0.05
+# Pause for keys without a configured rate that get throttled without a Retry-After
+DEFAULT_BACKOFF = 1.0
+
+
+def retry_after(headers) -> float | None:
+    """Seconds from a Retry-After header, either delta-seconds or an HTTP date."""
+    value = headers.get("Retry-After") if headers else None
+    if not value:
+        return None
+
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - datetime.now(timezone.utc)).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class RateLimiter:
+    """Token buckets keyed like "rpc:mainnet.base.org" or "api:api.odos.xyz", with a rate (req/s) per key prefix.
+
+    Rates adapt: a throttling response halves the key's rate (and a Retry-After pauses it), after
+    which it climbs back to the configured rate while the host stays quiet. Callers wait for their
+    turn instead of failing and sleeping in retry loops.
+    """
+
+    def __init__(self, rates: dict[str, float]):
+        self.rates = rates
+        self._buckets: dict[str, list[float]] = {}  # key -> [tokens, last refill]
+        self._throttled: dict[str, list[float]] = {}  # key -> [rate when throttled, throttled at]
+        self._paused_until: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def _current_rate(self, key: str, now: float) -> float:
+        rate = self.rates.get(key.split(":", 1)[0])
+        if not rate or key not in self._throttled:
+            return rate
+
+        throttled_rate, throttled_at = self._throttled[key]
+        recovered = throttled_rate + (now - throttled_at) * RECOVERY_PER_SECOND * rate
+
+        if recovered >= rate:
+            del self._throttled[key]
+            return rate
+
+        return recovered
+
+    def reserve(self, key: str) -> float:
+        """Take one token and return how long the caller has to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            paused = max(0.0, self._paused_until.get(key, 0) - now)
+
+            rate = self._current_rate(key, now)
+            if not rate:
+                return paused
+
+            tokens, refilled_at = self._buckets.get(key, [rate, now])
+
+            # Waiting out a pause counts as a reservation made at its end
+            start = now + paused
+            tokens = min(rate, tokens + max(0.0, start - refilled_at) * rate) - 1
+            self._buckets[key] = [tokens, max(start, refilled_at)]
+
+            return paused + max(0.0, -tokens / rate)
+
+    def report(self, key: str, status: int, retry_after: float | None = None) -> None:
+        """Feed back a response status, throttling statuses slow the key down."""
+        if status not in THROTTLE_STATUSES:
+            return
+
+        with self._lock:
+            now = time.monotonic()
+            rate = self._current_rate(key, now)
+
+            if rate:
+                floor = self.rates[key.split(":", 1)[0]] * MIN_RATE_FRACTION
+                self._throttled[key] = [max(floor, rate / 2), now]
+                # Drop the burst allowance, the host just told us it's too much
+                self._buckets[key] = [0.0, now]
+
+            pause = retry_after if retry_after is not None else (0 if rate else DEFAULT_BACKOFF)
+            if pause:
+                self._paused_until[key] = max(self._paused_until.get(key, 0), now + pause)
+
+
+_shared_limiter = None
+
+
+def _get_shared_limiter() -> RateLimiter:
+    """Runs inside the coordinator process, every worker gets a proxy to the same instance."""
+    global _shared_limiter
+    if _shared_limiter is None:
+        _shared_limiter = RateLimiter({"rpc": settings.RPC_RATE_LIMIT, "api": settings.API_RATE_LIMIT})
+    return _shared_limiter
+
+
+class RateLimitManager(BaseManager):
+    """Serves one RateLimiter to every worker process over a local socket/pipe."""
+
+
+RateLimitManager.register("get_limiter", callable=_get_shared_limiter)
+
+# Process-local by default, sharded workers swap in the coordinator's proxy
+_limiter = RateLimiter({"rpc": settings.RPC_RATE_LIMIT, "api": settings.API_RATE_LIMIT})
+
+
+def configure(limiter) -> None:
+    """Use `limiter` (a local RateLimiter or a RateLimitManager proxy) for this process."""
+    global _limiter
+    _limiter = limiter
+
+
+def acquire(key: str) -> None:
+    wait = _limiter.reserve(key)
+    if wait:
+        time.sleep(wait)
+
+
+def report(key: str, status: int, retry_after: float | None = None) -> None:
+    _limiter.report(key, status, retry_after)
@@ -0,0 +1,107 @@
+import threading
+import time
+from concurrent.futures import Future
+from concurrent.futures import TimeoutError as FutureTimeoutError
+
+from hexbytes import HexBytes
+from web3._utils.method_formatters import receipt_formatter
+from web3.datastructures import AttributeDict
+from web3.exceptions import TimeExhausted
+from web3.types import RPCEndpoint, TxReceipt
+
+import settings
+from modules.logger import logger
+from modules.rpc import is_transient, provider_pool
+
+
+class ReceiptTracker:
+    """Watches block heads once per chain and resolves every pending tx hash in one batched pass per block."""
+
+    def __init__(self, poll_interval: float = 1):
+        self.poll_interval = poll_interval
+
+        self._pending: dict[str, dict[HexBytes, Future]] = {}
+        self._threads: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+        self._no_batch: set[str] = set()
+
+    def track(self, chain_name: str, tx_hash) -> Future:
+        """Future resolving to the tx receipt once the tx is mined."""
+        tx_hash = HexBytes(tx_hash)
+
+        with self._lock:
+            pending = self._pending.setdefault(chain_name, {})
+            future = pending.setdefault(tx_hash, Future())
+
+            if chain_name not in self._threads:
+                thread = threading.Thread(target=self._watch, args=(chain_name,), daemon=True)
+                self._threads[chain_name] = thread
+                thread.start()
+
+        return future
+
+    def wait(self, chain_name: str, tx_hash, timeout: float = 400) -> TxReceipt:
+        future = self.track(chain_name, tx_hash)
+
+        try:
+            return future.result(timeout=timeout)
+        except FutureTimeoutError:
+            with self._lock:
+                self._pending.get(chain_name, {}).pop(HexBytes(tx_hash), None)
+
+            tx_hash = HexBytes(tx_hash).to_0x_hex()
+            raise TimeExhausted(f"Transaction {tx_hash} is not in the chain after {timeout} seconds")
+
+    def _fetch_receipts(self, chain_name: str, tx_hashes: list[HexBytes]) -> list:
+        w3 = provider_pool.get_web3(chain_name)
+        requests = [(RPCEndpoint("eth_getTransactionReceipt"), [tx_hash.to_0x_hex()]) for tx_hash in tx_hashes]
+
+        if len(requests) > 1 and chain_name not in self._no_batch:
+            try:
+                return [response.get("result") for response in w3.provider.make_batch_request(requests)]
+            except Exception as err:
+                # A network blip or throttling: poll again next interval rather than giving up on batches
+                if is_transient(err):
+                    raise
+
+                logger.warning(f"{chain_name.title()} RPC rejected batch receipt lookup, using sequential calls: {err}")
+                self._no_batch.add(chain_name)
+
+        return [w3.provider.make_request(method, params).get("result") for method, params in requests]
+
+    def _watch(self, chain_name: str) -> None:
+        w3 = provider_pool.get_web3(chain_name)
+        last_block = None
+
+        while True:
+            with self._lock:
+                tx_hashes = list(self._pending.get(chain_name, {}))
+
+                if not tx_hashes:
+                    self._threads.pop(chain_name, None)
+                    return
+
+            try:
+                block_number = w3.eth.block_number
+
+                if block_number != last_block:
+                    receipts = self._fetch_receipts(chain_name, tx_hashes)
+                    last_block = block_number
+
+                    with self._lock:
+                        pending = self._pending.get(chain_name, {})
+
+                        for tx_hash, receipt in zip(tx_hashes, receipts):
+                            future = pending.get(tx_hash)
+
+                            if receipt and future:
+                                pending.pop(tx_hash)
+                                future.set_result(AttributeDict.recursive(receipt_formatter(receipt)))
+
+            except Exception as err:
+                logger.warning(f"{chain_name.title()} receipt polling failed: {err}")
+
+            time.sleep(self.poll_interval)
+
+
+receipt_tracker = ReceiptTracker(poll_interval=settings.RECEIPT_POLL_INTERVAL)
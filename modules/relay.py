@@ -1,14 +1,17 @@
 import random
+import time
 
 from tenacity import retry, retry_if_exception_type, stop_after_attempt, wait_fixed
 from web3 import constants
 
 import settings
 from models.network import Network
+from models.route import RouteQuote
 from models.responses.relay.quote import Quote
-from modules.http import HttpClient
+from modules.http import http_clients
 from modules.logger import logger
-from modules.utils import wei
+from modules.routing import fill_times
+from modules.utils import ether, wei
 from modules.wallet import Wallet
 
 
@@ -26,7 +29,7 @@ class Relay(Wallet):
     def __init__(self, pk, _id, proxy, chain, dest_chain):
         super().__init__(pk, _id, chain)
         self.label += "Relay |"
-        self.http = HttpClient(self.BASE_URL, proxy)
+        self.http = http_clients.get(self.BASE_URL, proxy)
 
         self.src_chain: Network = self.chain
         self.dest_chain: str = dest_chain
@@ -35,7 +38,7 @@ class Relay(Wallet):
     def amount(self):
         return random.uniform(*settings.REFUEL_AMOUNT)
 
-    def _quote(self, dest_id: int) -> Quote:
+    def _quote(self, dest_id: int, amount: int) -> Quote:
         payload = {
             "user": self.address,
             "originChainId": self.chain.chain_id,
@@ -44,14 +47,32 @@ class Relay(Wallet):
             "destinationCurrency": constants.ADDRESS_ZERO,
             "recipient": self.address,
             "tradeType": "EXACT_INPUT",
-            "amount": str(wei(self.amount)),
+            "amount": str(amount),
             "referrer": "relay.link/swap",
             "useExternalLiquidity": False,
             "useDepositAddress": False,
         }
 
         resp = self.http.post("/quote", json=payload)
-        return Quote(**resp.json())
+        quote = Quote(**resp.json())
+
+        if not quote.steps or not quote.steps[0].items:
+            raise ValueError("Invalid quote response: missing steps or items")
+
+        return quote
+
+    def quote_refuel(self, amount: int) -> RouteQuote:
+        """Quote a refuel of `amount` wei for best-provider selection."""
+        to_chain = self.get_chain_by_name(self.dest_chain)
+        quote = self._quote(to_chain.chain_id, amount)
+
+        return RouteQuote(
+            amount_in=amount,
+            amount_out=int(quote.details.currencyOut.amount),
+            gas=int(quote.steps[0].items[0].data.gas),
+            eta=quote.details.timeEstimate,
+            data=quote,
+        )
 
     def _verify_deposit(self, request_id: str) -> None:
         endpoint = f"/intents/status?requestId={request_id}"
@@ -96,18 +117,15 @@ class Relay(Wallet):
             logger.info(f"{self.label} Receipt not available yet")
             raise ReceiptNotAvailable("Receipt not available")
 
-    def refuel(self) -> bool:
+    def refuel(self, route: RouteQuote = None) -> bool:
         to_chain = self.get_chain_by_name(self.dest_chain)
-        quote = self._quote(dest_id=to_chain.chain_id)
-
-        if not quote.steps or not quote.steps[0].items:
-            raise ValueError("Invalid quote response: missing steps or items")
+        quote = route.data if route else self._quote(to_chain.chain_id, wei(self.amount))
 
         tx_data = quote.steps[0].items[0].data
         tx = {
             "from": self.address,
             "to": self.w3.to_checksum_address(tx_data.to),
-            "nonce": self.w3.eth.get_transaction_count(self.address),
+            "nonce": self.next_nonce(),
             "chainId": self.chain.chain_id,
             "value": int(tx_data.value),
             "data": tx_data.data,
@@ -116,13 +134,15 @@ class Relay(Wallet):
             "maxPriorityFeePerGas": int(tx_data.maxPriorityFeePerGas),
         }
 
+        started = time.monotonic()
         tx_status = self.send_tx(
             tx,
-            tx_label=f"{self.label} Refuel {self.amount:.6f} ETH {self.chain.name.title()} -> {to_chain.name.title()}",
+            tx_label=f"{self.label} Refuel {ether(tx['value']):.6f} ETH {self.chain.name.title()} -> {to_chain.name.title()}",
         )
 
         if tx_status:
             self._verify_deposit(quote.steps[0].requestId)
+            fill_times.record(self, time.monotonic() - started)
             self._get_receipt(quote.steps[0].requestId)
             return True
 
@@ -0,0 +1,137 @@
+import math
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+
+import settings
+from models.route import RouteQuote
+from modules.endpoints import EWMA_ALPHA
+from modules.fees import fee_oracle
+from modules.logger import logger
+from modules.wallet import Wallet
+
+# Quotes are short HTTP/eth_call requests, run off the caller's thread so they overlap
+_executor = ThreadPoolExecutor(thread_name_prefix="quote")
+
+
+class FillTimes:
+    """Rolling refuel delivery times per provider and route, from the deposits confirmed in this process."""
+
+    def __init__(self):
+        self._seconds: dict[tuple[str, str, str], float] = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(dapp: Wallet) -> tuple[str, str, str]:
+        return type(dapp).__name__, dapp.chain.name, dapp.dest_chain
+
+    def record(self, dapp: Wallet, seconds: float) -> None:
+        key = self._key(dapp)
+
+        with self._lock:
+            previous = self._seconds.get(key)
+            self._seconds[key] = seconds if previous is None else EWMA_ALPHA * seconds + (1 - EWMA_ALPHA) * previous
+
+    def expected(self, dapp: Wallet, quoted: float = None) -> float:
+        """Observed fill time, else the provider's own estimate, else unknown (infinite)."""
+        with self._lock:
+            observed = self._seconds.get(self._key(dapp))
+
+        return next((seconds for seconds in (observed, quoted) if seconds is not None), float("inf"))
+
+
+fill_times = FillTimes()
+
+
+def _fee_per_gas(fees: Future) -> int:
+    fees = fees.result()
+    return fees.get("maxFeePerGas", fees.get("gasPrice", 0))
+
+
+def _race(quoters: list[Wallet], method: str, args: tuple, deadline: float) -> list[tuple[Wallet, RouteQuote]]:
+    """Call `quoter.<method>(*args)` on every quoter at once and collect the quotes.
+
+    Quotes still pending after `deadline` seconds are dropped, unless none has arrived yet,
+    then the first to answer wins. Raises the last quote error if every quoter failed.
+    """
+    futures = {_executor.submit(getattr(quoter, method), *args): quoter for quoter in quoters}
+    quotes: list[tuple[Wallet, RouteQuote]] = []
+    error = None
+
+    done, pending = wait(futures, timeout=deadline)
+
+    while True:
+        for future in done:
+            if future.exception() is None:
+                quotes.append((futures[future], future.result()))
+            else:
+                error = future.exception()
+                logger.warning(f"{futures[future].label} Quote failed: {error}")
+
+        if quotes or not pending:
+            break
+
+        for future in pending:
+            logger.warning(f"{futures[future].label} No quote after {deadline}s, waiting for the first one")
+
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+    if not quotes:
+        raise error
+
+    return quotes
+
+
+def net_output(quote: RouteQuote, to_eth: bool, fee_per_gas: int) -> float:
+    """Quoted output minus the swap's gas cost, in output token units."""
+    gas_cost = quote.gas * fee_per_gas
+
+    # Buying oUSDT with ETH: price the gas at the quote's own ETH -> oUSDT rate
+    if not to_eth:
+        gas_cost = gas_cost * quote.amount_out / quote.amount_in
+
+    return quote.amount_out - gas_cost
+
+
+def best_route(dexes: list[Wallet], amount_in: int, to_eth: bool, deadline: float) -> tuple[Wallet, RouteQuote]:
+    """Quote `amount_in` on every DEX at once and return the one with the best output net of gas."""
+    fees = _executor.submit(fee_oracle.get_fees, dexes[0].chain)
+    quotes = _race(dexes, "quote_swap", (amount_in, to_eth), deadline)
+    fee_per_gas = _fee_per_gas(fees)
+
+    ranked = sorted(quotes, key=lambda pair: net_output(pair[1], to_eth, fee_per_gas), reverse=True)
+    dex, quote = ranked[0]
+
+    if len(ranked) > 1:
+        best, runner_up = (net_output(q, to_eth, fee_per_gas) for q in (quote, ranked[1][1]))
+        logger.info(
+            f"{dex.label} Best route: {type(dex).__name__} beats {type(ranked[1][0]).__name__} "
+            f"by {(best - runner_up) / abs(runner_up or 1):.2%} net of gas"
+        )
+
+    return dex, quote
+
+
+def best_refuel(dapps: list[Wallet], amount: int, deadline: float) -> tuple[Wallet, RouteQuote]:
+    """Quote a refuel of `amount` wei with every provider at once and return the best one.
+
+    The most ETH delivered net of source gas wins. Quotes within REFUEL_PRICE_TOLERANCE of it
+    are ranked by fill time instead: observed on earlier refuels, else the provider's estimate.
+    """
+    fees = _executor.submit(fee_oracle.get_fees, dapps[0].chain)
+    quotes = _race(dapps, "quote_refuel", (amount,), deadline)
+    fee_per_gas = _fee_per_gas(fees)
+
+    delivered = {id(quote): quote.amount_out - quote.gas * fee_per_gas for _, quote in quotes}
+    floor = max(delivered.values()) * (1 - settings.REFUEL_PRICE_TOLERANCE)
+
+    contenders = [(dapp, quote) for dapp, quote in quotes if delivered[id(quote)] >= floor]
+    dapp, quote = min(contenders, key=lambda pair: fill_times.expected(pair[0], pair[1].eta))
+
+    if len(quotes) > 1:
+        fill_time = fill_times.expected(dapp, quote.eta)
+        logger.info(
+            f"{dapp.label} Best refuel of {len(quotes)} quotes: {quote.amount_out / 10**18:.6f} ETH delivered"
+            + (f" in ~{fill_time:.0f}s" if math.isfinite(fill_time) else "")
+        )
+
+    return dapp, quote
@@ -0,0 +1,285 @@
+import json
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+import requests
+from requests.adapters import HTTPAdapter
+from web3 import HTTPProvider, Web3
+from web3._utils.batching import sort_batch_response_by_response_ids
+from web3._utils.http import DEFAULT_HTTP_TIMEOUT
+from web3.middleware import ExtraDataToPOAMiddleware
+
+import settings
+from models.network import Network
+from modules import ratelimit
+from modules.config import CHAIN_MAPPING
+from modules.endpoints import Endpoint, EndpointSet
+from modules.metrics import metrics
+
+
+# Reads that are safe to send to a second endpoint when the first one is slow
+HEDGEABLE_METHODS = {
+    "eth_blockNumber",
+    "eth_call",
+    "eth_estimateGas",
+    "eth_feeHistory",
+    "eth_gasPrice",
+    "eth_getBalance",
+    "eth_getBlockByNumber",
+    "eth_getTransactionReceipt",
+    "eth_maxPriorityFeePerGas",
+}
+# Writes and the nonce reads they depend on stay on one endpoint
+PINNED_METHODS = {"eth_sendRawTransaction", "eth_sendTransaction", "eth_getTransactionCount"}
+
+# Shared by every chain, only used by reads that already outlasted the hedge delay
+_hedge_executor = ThreadPoolExecutor(max_workers=settings.RPC_POOL_SIZE, thread_name_prefix="rpc-hedge")
+
+
+def _has_error(raw_response: bytes) -> bool:
+    response = json.loads(raw_response)
+    items = response if isinstance(response, list) else [response]
+    return any("error" in item for item in items)
+
+
+def is_transient(err: Exception) -> bool:
+    """Connection problems, timeouts and throttling/5xx statuses, worth trying again next time."""
+    if isinstance(err, requests.HTTPError):
+        return err.response is None or err.response.status_code == 429 or err.response.status_code >= 500
+
+    return isinstance(err, requests.RequestException)
+
+
+class FailoverHTTPProvider(HTTPProvider):
+    """HTTPProvider spreading requests over several endpoints of one chain.
+
+    Every round trip, single or batch, goes through `_post`, which picks endpoints from the
+    chain's EndpointSet, fails over on transport errors and optionally hedges slow reads.
+    All endpoints and threads post through the one `session` given, web3's own session cache is per thread.
+    """
+
+    def __init__(
+        self,
+        chain_name: str,
+        endpoint_uris: list[str],
+        hedge_delay: float = 0,
+        session: requests.Session = None,
+        **kwargs,
+    ):
+        super().__init__(endpoint_uris[0], **kwargs)
+        self.endpoints = EndpointSet(chain_name, endpoint_uris)
+        self.hedge_delay = hedge_delay
+        self._session = session or requests.Session()
+
+    def _make_request(self, method, request_data):
+        return self._post([method], request_data, batch=False)
+
+    def make_batch_request(self, batch_requests):
+        request_data = self.encode_batch_rpc_request(batch_requests)
+        raw_response = self._post([method for method, _ in batch_requests], request_data, batch=True)
+
+        return sort_batch_response_by_response_ids(self.decode_rpc_response(raw_response))
+
+    def _send(self, endpoint: Endpoint, request_data: bytes, read_timeout: float = None) -> bytes:
+        kwargs = {"timeout": DEFAULT_HTTP_TIMEOUT, **self.get_request_kwargs()}
+        if read_timeout:
+            connect_timeout = kwargs["timeout"][0] if isinstance(kwargs["timeout"], tuple) else kwargs["timeout"]
+            kwargs["timeout"] = (connect_timeout, read_timeout)
+
+        started = time.perf_counter()
+
+        try:
+            with self._session.post(endpoint.url, data=request_data, **kwargs) as response:
+                response.raise_for_status()
+                raw_response = response.content
+        except requests.ReadTimeout as err:
+            if read_timeout:
+                # Hedge probe: only slower than the hedge delay, not failed
+                self.endpoints.record_latency(endpoint, time.perf_counter() - started)
+            else:
+                self.endpoints.record_failure(endpoint, err)
+            raise
+        except requests.RequestException as err:
+            self.endpoints.record_failure(endpoint, err)
+            raise
+
+        self.endpoints.record_success(endpoint, time.perf_counter() - started)
+        return raw_response
+
+    def _post(self, methods: list[str], request_data: bytes, batch: bool) -> bytes:
+        if any(method in PINNED_METHODS for method in methods):
+            candidates = self.endpoints.pinned()
+        else:
+            candidates = self.endpoints.ranked()
+
+        hedge = self.hedge_delay and len(candidates) > 1 and all(method in HEDGEABLE_METHODS for method in methods)
+        if hedge:
+            try:
+                # From the caller's thread, so the delay only runs once the request is on the wire
+                return self._send(candidates[0], request_data, read_timeout=self.hedge_delay)
+            except requests.ReadTimeout:
+                return self._send_hedged(candidates, request_data)
+            except requests.RequestException:
+                candidates = candidates[1:]
+
+        for endpoint in candidates[:-1]:
+            try:
+                return self._send(endpoint, request_data)
+            except requests.RequestException:
+                continue
+
+        return self._send(candidates[-1], request_data)
+
+    def _send_hedged(self, candidates: list[Endpoint], request_data: bytes) -> bytes:
+        """The best endpoint didn't answer within `hedge_delay`: race it again against the next one,
+        bringing in further endpoints as attempts fail."""
+        pending = {_hedge_executor.submit(self._send, endpoint, request_data) for endpoint in candidates[:2]}
+        remaining = iter(candidates[2:])
+        error = None
+
+        while pending:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+
+            for future in done:
+                if future.exception() is None:
+                    return future.result()
+                error = future.exception()
+
+                endpoint = next(remaining, None)
+                if endpoint is not None:
+                    pending.add(_hedge_executor.submit(self._send, endpoint, request_data))
+
+        raise error
+
+
+class InstrumentedHTTPProvider(FailoverHTTPProvider):
+    """Records latency, payload size and errors of every round trip, batches included."""
+
+    def __init__(self, chain_name: str, *args, **kwargs):
+        super().__init__(chain_name, *args, **kwargs)
+        self.metrics_target = f"rpc:{chain_name}"
+
+    def _post(self, methods: list[str], request_data: bytes, batch: bool) -> bytes:
+        if not metrics.enabled:
+            return super()._post(methods, request_data, batch)
+
+        started = time.perf_counter()
+        raw_response = None
+
+        try:
+            raw_response = super()._post(methods, request_data, batch)
+            return raw_response
+        finally:
+            elapsed = time.perf_counter() - started
+            responses = json.loads(raw_response) if raw_response else {"error": None}
+            if not isinstance(responses, list):
+                # A single call, or a whole batch rejected by a provider without batch support
+                responses = [responses] * len(methods)
+
+            # Each batch item is one call of its method, sharing the batch's latency and size
+            for method, response in zip(methods, responses):
+                metrics.record(
+                    self.metrics_target,
+                    f"{method} (batched)" if batch else method,
+                    elapsed,
+                    sent=len(request_data) // len(methods),
+                    received=len(raw_response or b"") // len(methods),
+                    error="error" in response,
+                )
+
+
+class RateLimitedHTTPProvider(InstrumentedHTTPProvider):
+    """HTTPProvider drawing from the shared per-endpoint request budget before every round trip,
+    and telling the limiter when an endpoint throttles."""
+
+    def __init__(self, chain_name: str, *args, chain_id: int = None, **kwargs):
+        super().__init__(chain_name, *args, **kwargs)
+        self.chain_id = chain_id
+
+    def make_request(self, method, params):
+        # web3's validation middleware asks for eth_chainId before every call/estimate, and its own
+        # request cache is per thread, so answer from the chain config instead
+        if method == "eth_chainId" and self.chain_id is not None:
+            return {"jsonrpc": "2.0", "id": 0, "result": hex(self.chain_id)}
+
+        return super().make_request(method, params)
+
+    def _send(self, endpoint: Endpoint, request_data: bytes, read_timeout: float = None) -> bytes:
+        key = f"rpc:{endpoint.host}"
+        # With several endpoints a throttled request fails over, with one it queues up again here
+        attempts = settings.THROTTLE_RETRIES + 1 if len(self.endpoints) == 1 else 1
+
+        for attempt in range(attempts):
+            ratelimit.acquire(key)
+
+            try:
+                return super()._send(endpoint, request_data, read_timeout=read_timeout)
+            except requests.HTTPError as err:
+                status = err.response.status_code if err.response is not None else None
+                if status not in ratelimit.THROTTLE_STATUSES:
+                    raise
+
+                ratelimit.report(key, status, ratelimit.retry_after(err.response.headers))
+                if attempt == attempts - 1:
+                    raise
+
+
+class ProviderPool:
+    """Process-wide registry of keep-alive RPC connections, one pool per chain."""
+
+    def __init__(self, chains: dict[str, Network], pool_size: int = 10):
+        self.chains = chains
+        self.pool_size = pool_size
+
+        self._sessions: dict[str, requests.Session] = {}
+        self._instances: dict[str, Web3] = {}
+        self._lock = threading.Lock()
+
+    def _get_session(self, chain_name: str) -> requests.Session:
+        if chain_name not in self._sessions:
+            session = requests.Session()
+            # pool_block turns the pool size into a per-endpoint cap on in-flight requests
+            adapter = HTTPAdapter(
+                pool_connections=len(self.chains[chain_name].rpc_urls),
+                pool_maxsize=self.pool_size,
+                pool_block=True,
+            )
+            session.mount("https://", adapter)
+            session.mount("http://", adapter)
+
+            self._sessions[chain_name] = session
+
+        return self._sessions[chain_name]
+
+    def get_web3(self, chain_name: str) -> Web3:
+        """One Web3 per chain shared by every thread. Don't use web3's batch_requests() on it, since the
+        batching flag lives on the provider; send raw batches through `make_batch_request` instead."""
+        chain_name = chain_name.lower()
+
+        with self._lock:
+            if chain_name not in self._instances:
+                chain = self.chains[chain_name]
+                provider = RateLimitedHTTPProvider(
+                    chain_name,
+                    chain.rpc_urls,
+                    chain_id=chain.chain_id,
+                    hedge_delay=settings.RPC_HEDGE_DELAY,
+                    session=self._get_session(chain_name),
+                )
+                web3 = Web3(provider)
+                web3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
+
+                self._instances[chain_name] = web3
+
+            return self._instances[chain_name]
+
+    def close(self) -> None:
+        with self._lock:
+            for session in self._sessions.values():
+                session.close()
+            self._sessions.clear()
+            self._instances.clear()
+
+
+provider_pool = ProviderPool(CHAIN_MAPPING, pool_size=settings.RPC_POOL_SIZE)
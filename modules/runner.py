@@ -0,0 +1,147 @@
+import asyncio
+import multiprocessing
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+
+import settings
+from modules import ratelimit
+from modules.actions import Action
+from modules.cache import constants_cache
+from modules.logger import drain, forward_to, logger
+from modules.metrics import metrics
+from modules.ratelimit import RateLimitManager
+from modules.scheduler import StepScheduler
+from modules.utils import sleep
+
+
+async def _run_account(action: Action, account: dict, semaphore: asyncio.Semaphore, is_last: bool):
+    async with semaphore:
+        try:
+            tx_status = await asyncio.to_thread(action, account)
+        except Exception as err:
+            logger.error(f"{account['_id']} An error occurred: {err}")
+            tx_status = False
+
+    # Outside the semaphore, so the pause doesn't hold a slot another account could use
+    if tx_status and not is_last:
+        await asyncio.sleep(random.randint(*settings.SLEEP_BETWEEN_WALLETS))
+
+    return tx_status
+
+
+async def run_accounts(action: Action, accounts: list[dict], concurrency: int) -> list:
+    """Process up to `concurrency` accounts at once on one event loop, blocking I/O runs in worker threads."""
+    loop = asyncio.get_running_loop()
+    loop.set_default_executor(ThreadPoolExecutor(max_workers=concurrency, thread_name_prefix="account"))
+
+    semaphore = asyncio.Semaphore(concurrency)
+    return await asyncio.gather(
+        *(
+            _run_account(action, account, semaphore, is_last=index == len(accounts))
+            for index, account in enumerate(accounts, start=1)
+        )
+    )
+
+
+def run_concurrently(action: Action, accounts: list[dict], concurrency: int) -> list:
+    return asyncio.run(run_accounts(action, accounts, concurrency))
+
+
+def run_local(action: Action, accounts: list[dict]) -> list:
+    """Run `accounts` in this process: one by one, or concurrently per CONCURRENT_ACCOUNTS."""
+    if settings.CONCURRENT_ACCOUNTS > 1 and not action.interactive:
+        if settings.USE_STEP_SCHEDULER and action.resumable:
+            scheduler = StepScheduler(
+                max_in_flight=settings.CONCURRENT_ACCOUNTS,
+                workers=settings.STEP_WORKERS,
+                start_delay=settings.SLEEP_BETWEEN_WALLETS,
+            )
+            return scheduler.run(
+                [lambda account=account: action.steps(account) for account in accounts],
+                labels=[account["_id"] for account in accounts],
+            )
+
+        return run_concurrently(action, accounts, settings.CONCURRENT_ACCOUNTS)
+
+    results = []
+    for index, account in enumerate(accounts, start=1):
+        tx_status = action(account)
+        results.append(tx_status)
+
+        if tx_status and index < len(accounts):
+            sleep(*settings.SLEEP_BETWEEN_WALLETS)
+
+    return results
+
+
+def _init_worker(address, log_queue) -> None:
+    forward_to(log_queue)
+
+    # Workers inherit the parent's authkey, which the coordinator was started with
+    manager = RateLimitManager(address=address)
+    manager.connect()
+    ratelimit.configure(manager.get_limiter())
+
+
+def _run_shard(action: Action, accounts: list[dict]) -> tuple[list, list[dict], dict]:
+    """Statuses for `accounts`, plus the worker's request metrics and new cached constants for the parent to merge."""
+    if settings.CONCURRENT_ACCOUNTS > 1 and not action.interactive:
+        return run_local(action, accounts), metrics.export(), constants_cache.export()
+
+    results = []
+    for index, account in enumerate(accounts, start=1):
+        # A failing account must not take the rest of the shard down with it
+        try:
+            tx_status = action(account)
+        except Exception as err:
+            logger.error(f"{account['_id']} An error occurred: {err}")
+            tx_status = False
+
+        results.append(tx_status)
+
+        if tx_status and index < len(accounts):
+            time.sleep(random.randint(*settings.SLEEP_BETWEEN_WALLETS))
+
+    return results, metrics.export(), constants_cache.export()
+
+
+def run_sharded(action: Action, accounts: list[dict], processes: int) -> list:
+    """Split `accounts` across worker processes that share one rate limiter served by a local coordinator."""
+    coordinator = RateLimitManager()
+    coordinator.start()
+
+    # Workers log through the parent, so one process writes and rotates the log file
+    log_queue = multiprocessing.Queue()
+    log_drain = drain(log_queue)
+
+    shards = [accounts[index::processes] for index in range(processes)]
+    shards = [shard for shard in shards if shard]
+
+    try:
+        with ProcessPoolExecutor(
+            max_workers=len(shards),
+            initializer=_init_worker,
+            initargs=(coordinator.address, log_queue),
+        ) as executor:
+            shard_results = list(executor.map(_run_shard, [action] * len(shards), shards))
+    finally:
+        coordinator.shutdown()
+        log_queue.put(None)
+        log_drain.join()
+
+    results = {}
+    for shard, (statuses, shard_metrics, shard_constants) in zip(shards, shard_results):
+        metrics.merge(shard_metrics)
+        constants_cache.merge(shard_constants)
+
+        for account, tx_status in zip(shard, statuses):
+            results[account["_id"]] = tx_status
+
+    succeeded = sum(1 for tx_status in results.values() if tx_status)
+    logger.info(
+        f"Processed {len(accounts)} accounts in {len(shards)} processes: "
+        f"{succeeded} succeeded, {len(accounts) - succeeded} failed"
+    )
+
+    return [results[account["_id"]] for account in accounts]
@@ -0,0 +1,119 @@
+import queue
+import random
+import threading
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Generator, Iterable
+
+from modules.logger import logger
+
+# A flow runs blocking work between yields and yields a Future whenever it has to wait
+# (bridge delivery, pauses). The Future's result is sent back in when the flow resumes.
+# Waits inside a step (tx confirmations, approve()'s pause, refuel deposit checks) hold its worker thread.
+Flow = Generator[Future, object, object]
+
+
+def sleep_future(seconds: float) -> Future:
+    """Future resolving after `seconds` without holding a thread while waiting."""
+    future = Future()
+    timer = threading.Timer(seconds, future.set_result, args=(None,))
+    timer.daemon = True
+    timer.start()
+
+    return future
+
+
+def random_pause(min_time: int, max_time: int) -> Future:
+    if min_time > max_time:
+        min_time, max_time = max_time, min_time
+
+    return sleep_future(random.randint(min_time, max_time))
+
+
+def run_steps(flow: Flow):
+    """Drive a flow in the calling thread, blocking on every Future it yields."""
+    value, error = None, None
+
+    while True:
+        try:
+            awaited = flow.throw(error) if error else flow.send(value)
+        except StopIteration as stop:
+            return stop.value
+
+        try:
+            value, error = awaited.result(), None
+        except Exception as err:
+            value, error = None, err
+
+
+class StepScheduler:
+    """Runs many flows on a small worker pool, parking the ones that wait so others can move forward."""
+
+    def __init__(self, max_in_flight: int, workers: int, start_delay: tuple[int, int] = (0, 0)):
+        self.max_in_flight = max_in_flight
+        self.workers = workers
+        self.start_delay = start_delay
+
+        self._events: queue.Queue = queue.Queue()
+
+    def _step(self, index: int, flow: Flow, value=None, error: BaseException = None) -> None:
+        try:
+            awaited = flow.throw(error) if error else flow.send(value)
+        except StopIteration as stop:
+            self._events.put(("done", index, stop.value))
+            return
+        except Exception as err:
+            self._events.put(("error", index, err))
+            return
+
+        awaited.add_done_callback(lambda future: self._events.put(("resume", index, future)))
+
+    def run(self, flows: Iterable[Callable[[], Flow]], labels: list[str] = None) -> list:
+        """Start each flow factory, keeping at most `max_in_flight` flows alive; returns their results in order."""
+        factories = list(flows)
+        results = [None] * len(factories)
+        running: dict[int, Flow] = {}
+        next_index = 0
+
+        with ThreadPoolExecutor(max_workers=self.workers, thread_name_prefix="step") as executor:
+
+            def start_next():
+                nonlocal next_index
+                index, next_index = next_index, next_index + 1
+
+                running[index] = factories[index]()
+                executor.submit(self._step, index, running[index])
+
+            while next_index < len(factories) and len(running) < self.max_in_flight:
+                start_next()
+
+            while running:
+                event, index, payload = self._events.get()
+
+                if event == "resume":
+                    error = payload.exception()
+                    value = None if error else payload.result()
+                    executor.submit(self._step, index, running[index], value, error)
+                    continue
+
+                if event == "start":
+                    running.pop(index)
+                    start_next()
+                    continue
+
+                running.pop(index)
+
+                if event == "error":
+                    label = labels[index] if labels else index
+                    logger.error(f"{label} An error occurred: {payload}")
+                    results[index] = False
+                else:
+                    results[index] = payload
+
+                if next_index < len(factories):
+                    # Keep the slot reserved while the next wallet waits out its start delay
+                    running[-index - 1] = None
+                    random_pause(*self.start_delay).add_done_callback(
+                        lambda _, slot=-index - 1: self._events.put(("start", slot, None))
+                    )
+
+        return results
@@ -0,0 +1,57 @@
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+
+from eth_account import Account
+from eth_account.datastructures import SignedMessage, SignedTransaction
+from eth_account.messages import SignableMessage
+from eth_account.signers.local import LocalAccount
+
+import settings
+
+
+@lru_cache(maxsize=None)
+def derive_account(pk: str | bytes) -> LocalAccount:
+    """Account for a private key, derived once per process."""
+    return Account.from_key(pk)
+
+
+def _sign_transactions(pk: str | bytes, txs: list[dict]) -> list[SignedTransaction]:
+    account = derive_account(pk)
+    return [account.sign_transaction(tx) for tx in txs]
+
+
+def _sign_message(pk: str | bytes, message: SignableMessage) -> SignedMessage:
+    return derive_account(pk).sign_message(message)
+
+
+class Signer:
+    """Signs inline, or on a process pool so signing doesn't compete with I/O threads for the GIL."""
+
+    def __init__(self, processes: int = 0):
+        self.processes = processes
+        self._executor = None
+
+    @property
+    def executor(self) -> ProcessPoolExecutor | None:
+        if self.processes and self._executor is None:
+            self._executor = ProcessPoolExecutor(max_workers=self.processes)
+        return self._executor
+
+    def sign_transactions(self, pk: str | bytes, txs: list[dict]) -> list[SignedTransaction]:
+        """Sign a batch of txs for one key in a single round trip to the pool."""
+        if not self.executor:
+            return _sign_transactions(pk, txs)
+
+        return self.executor.submit(_sign_transactions, pk, txs).result()
+
+    def sign_transaction(self, pk: str | bytes, tx: dict) -> SignedTransaction:
+        return self.sign_transactions(pk, [tx])[0]
+
+    def sign_message(self, pk: str | bytes, message: SignableMessage) -> SignedMessage:
+        if not self.executor:
+            return _sign_message(pk, message)
+
+        return self.executor.submit(_sign_message, pk, message).result()
+
+
+signer = Signer(processes=settings.SIGNER_PROCESSES)
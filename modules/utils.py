@@ -1,14 +1,23 @@
 import csv
 import os
 import random
+import threading
 import time
 from datetime import datetime
 from decimal import Decimal
 
-import requests
 from tqdm import tqdm
 from web3 import Web3
 
+import settings
+from modules.http import http_clients
+
+PRICE_API_URL = "https://api.binance.com/api/v3"
+
+# symbol -> (fetched at, price), shared by every wallet in the process
+_prices: dict[str, tuple[float, float]] = {}
+_prices_lock = threading.Lock()
+
 
 def get_random_token(tokens: list[str]) -> str:
     _, token_address = random.choice([(k, v) for k, v in tokens.items() if k != "WETH"])
@@ -16,11 +25,20 @@ def get_random_token(tokens: list[str]) -> str:
 
 
 def get_token_price(symbol: str = "ETH") -> float:
-    url = f"https://api.binance.com/api/v3/ticker/price?symbol={symbol}USDT"
-    response = requests.get(url)
-    data = response.json()
+    """USDT price, cached for PRICE_CACHE_TTL seconds."""
+    with _prices_lock:
+        fetched_at, price = _prices.get(symbol, (0, None))
+
+    if price is not None and time.monotonic() - fetched_at < settings.PRICE_CACHE_TTL:
+        return price
+
+    response = http_clients.get(PRICE_API_URL).get("/ticker/price", params={"symbol": f"{symbol}USDT"})
+    price = float(response.json()["price"])
+
+    with _prices_lock:
+        _prices[symbol] = (time.monotonic(), price)
 
-    return float(data["price"])
+    return price
 
 
 def wei(value: float) -> int:
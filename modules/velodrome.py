@@ -4,6 +4,7 @@ from eth_abi import encode
 from eth_utils import to_bytes
 
 import settings
+from models.route import RouteQuote
 from modules.config import OUSDT, QUOTER, QUOTER_ABI, ROUTER, ROUTER_ABI, WETH
 from modules.logger import logger
 from modules.utils import ether, wei
@@ -11,6 +12,7 @@ from modules.wallet import Wallet
 
 commands = {"WRAP_SWAP": "0x0b00", "SWAP_UNWRAP": "0x000c"}
 FEE_BIPS = 100  # 0.01% fee tier | bip = 1/10000
+EXECUTE_GAS = 75_000  # intrinsic gas, WETH wrap/unwrap and router dispatch, on top of the quoter's pool estimate
 
 
 class Velodrome(Wallet):
@@ -21,7 +23,7 @@ class Velodrome(Wallet):
         self.quoter = self.get_contract(QUOTER[self.chain.name], abi=QUOTER_ABI)
         self.router = self.get_contract(ROUTER[self.chain.name], abi=ROUTER_ABI)
 
-    def _get_amount_out(self, path: bytes, amount_in: int, slippage: int = 1) -> int:
+    def _quote_exact_input(self, path: bytes, amount_in: int) -> tuple[int, int]:
         """
         quoteExactInput returns []:
             amountOut
@@ -40,13 +42,24 @@ class Velodrome(Wallet):
                 [1512879, [1728150856839541183868667626044367], [1], 139086]
         """
 
-        amount_out = self.quoter.functions.quoteExactInput(path, amount_in).call()[0]
-        min_amount_out = int(amount_out * (1 - slippage / 100))
+        result = self.quoter.functions.quoteExactInput(path, amount_in).call()
+        amount_out, gas_estimate = result[0], result[-1]
 
         if amount_out <= 0:
             raise ValueError("Invalid quoted amount")
 
-        return min_amount_out
+        return amount_out, gas_estimate
+
+    def _get_amount_out(self, path: bytes, amount_in: int, slippage: int = 1, quoted: int = None) -> int:
+        amount_out = quoted or self._quote_exact_input(path, amount_in)[0]
+        return int(amount_out * (1 - slippage / 100))
+
+    def quote_swap(self, amount_in: int, to_eth: bool = False) -> RouteQuote:
+        """Quote ETH -> oUSDT, or oUSDT -> ETH with `to_eth`, for best-route selection."""
+        token_in, token_out = (OUSDT, WETH) if to_eth else (WETH, OUSDT)
+        amount_out, gas_estimate = self._quote_exact_input(self._build_swap_path(token_in, token_out), amount_in)
+
+        return RouteQuote(amount_in=amount_in, amount_out=amount_out, gas=gas_estimate + EXECUTE_GAS)
 
     def _build_swap_path(self, token_in: str, token_out: str) -> bytes:
         hexstr = (
@@ -56,14 +69,14 @@ class Velodrome(Wallet):
         )
         return to_bytes(hexstr=hexstr)
 
-    def _build_eth_swap(self, amount_in: int, token_in: str, token_out: str):
+    def _build_eth_swap(self, amount_in: int, token_in: str, token_out: str, quoted: int = None):
         """ETH → WETH → oUSDT swap construction"""
         # 1. Wrap ETH parameters
         wrap_params = encode(["address", "uint256"], [self.router.address, amount_in])
 
         # 2. Swap parameters
         path = self._build_swap_path(token_in, token_out)
-        amount_out = self._get_amount_out(path, amount_in)
+        amount_out = self._get_amount_out(path, amount_in, quoted=quoted)
 
         swap_params = encode(
             ["address", "uint256", "uint256", "bytes", "bool"],
@@ -72,11 +85,11 @@ class Velodrome(Wallet):
 
         return commands["WRAP_SWAP"], [wrap_params, swap_params], amount_in, amount_out
 
-    def _build_erc20_swap(self, amount_in: int, token_in: str, token_out: str):
+    def _build_erc20_swap(self, amount_in: int, token_in: str, token_out: str, quoted: int = None):
         """oUSDT → WETH → ETH swap construction"""
         # 1. Swap parameters
         path = self._build_swap_path(token_in, token_out)
-        amount_out = self._get_amount_out(path, amount_in)
+        amount_out = self._get_amount_out(path, amount_in, quoted=quoted)
 
         swap_params = encode(
             ["address", "uint256", "uint256", "bytes", "bool"],
@@ -88,13 +101,15 @@ class Velodrome(Wallet):
 
         return commands["SWAP_UNWRAP"], [swap_params, unwrap_params], 0, amount_out
 
-    def swap_eth(self, token_in: str = WETH, token_out: str = OUSDT):
-        amount_in = wei(random.uniform(*settings.SWAP_AMOUNT))
+    def swap_eth(self, token_in: str = WETH, token_out: str = OUSDT, route: RouteQuote = None):
+        amount_in = route.amount_in if route else wei(random.uniform(*settings.SWAP_AMOUNT))
         _, decimals, symbol = self.get_token_info(token_out)
 
-        commands, inputs, value, amount_out = self._build_eth_swap(amount_in, token_in, token_out)
+        commands, inputs, value, amount_out = self._build_eth_swap(
+            amount_in, token_in, token_out, quoted=route and route.amount_out
+        )
 
-        contract_tx = self.router.functions.execute(commands, inputs).build_transaction(self.get_tx_data(value=value))
+        contract_tx = self.build_contract_tx(self.router.functions.execute(commands, inputs), value=value)
 
         return self.send_tx(
             contract_tx,
@@ -102,19 +117,22 @@ class Velodrome(Wallet):
             gas_multiplier=1.1,
         )
 
-    def swap_erc20(self, token_in: str = OUSDT, token_out: str = WETH):
-        balance, decimals, symbol = self.get_token_info(token_in)
-        amount_in = int(balance * random.uniform(*settings.SWAP_BACK_PERCENTAGE))
+    def swap_erc20(self, token_in: str = OUSDT, token_out: str = WETH, route: RouteQuote = None):
+        token_info = self.get_token_info(token_in, as_dict=True, spender=self.router.address)
+        balance, decimals, symbol = token_info["balance"], token_info["decimals"], token_info["symbol"]
+        amount_in = route.amount_in if route else int(balance * random.uniform(*settings.SWAP_BACK_PERCENTAGE))
 
         if not balance:
             logger.warning(f"{self.label} No {symbol} tokens to swap \n")
             return
 
-        commands, inputs, value, amount_out = self._build_erc20_swap(amount_in, token_in, token_out)
+        commands, inputs, value, amount_out = self._build_erc20_swap(
+            amount_in, token_in, token_out, quoted=route and route.amount_out
+        )
 
-        self.approve(token_in, self.router.address, amount_in)
+        self.approve(token_in, self.router.address, amount_in, token_info=token_info)
 
-        contract_tx = self.router.functions.execute(commands, inputs).build_transaction(self.get_tx_data(value=value))
+        contract_tx = self.build_contract_tx(self.router.functions.execute(commands, inputs), value=value)
 
         return self.send_tx(
             contract_tx,
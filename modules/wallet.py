@@ -1,33 +1,43 @@
 import random
 import time
 
-from eth_account import Account
 from eth_account.messages import encode_defunct
-from web3 import HTTPProvider, Web3
+from web3 import Web3
 from web3.contract import Contract
-from web3.exceptions import Web3Exception, Web3RPCError
-from web3.middleware import ExtraDataToPOAMiddleware
+from web3.exceptions import TimeExhausted, Web3Exception, Web3RPCError
 
 from models.network import Network
+from modules.cache import constants_cache
 from modules.config import CHAIN_MAPPING, ERC20_ABI
+from modules.contracts import contract_cache, encode_call
+from modules.fees import fee_oracle
 from modules.logger import logger
+from modules.multicall import Multicall
+from modules.nonce import nonce_manager
+from modules.receipts import receipt_tracker
+from modules.rpc import provider_pool
+from modules.signer import derive_account, signer
 
 
 class Wallet:
     def __init__(self, pk: str, _id: str = None, chain: str = "optimism"):
-        self.account = Account.from_key(pk)
+        self.account = derive_account(pk)
         self.address = self.account.address
         self.label = f"{_id} {self.address} | "
 
         self.chain: Network = self.get_chain_by_name(chain)
         self.w3 = self.get_web3(chain)
+        self.last_receipt = None  # receipt of the last tx confirmed by send_tx
 
     def __str__(self) -> str:
         return f"Wallet(address={self.address})"
 
     @property
     def tx_count(self):
-        return self.w3.eth.get_transaction_count(self.address)
+        return nonce_manager.peek(self.w3, self.address, self.chain.name)
+
+    def next_nonce(self) -> int:
+        return nonce_manager.next_nonce(self.w3, self.address, self.chain.name)
 
     def get_chain_by_name(self, name: str) -> Network:
         return CHAIN_MAPPING.get(name.lower())
@@ -36,38 +46,68 @@ class Wallet:
         return [network.name for network in CHAIN_MAPPING.values() if network.chain_id == chain_id][0]
 
     def get_web3(self, chain_name: str) -> Web3:
-        chain: Network = self.get_chain_by_name(chain_name)
-        web3 = Web3(HTTPProvider(chain.rpc_url))
-        web3.middleware_onion.inject(ExtraDataToPOAMiddleware, layer=0)
-
-        return web3
+        return provider_pool.get_web3(chain_name)
 
     def get_contract(self, address: str, abi: dict = None, chain_name: str = None) -> Contract:
         w3: Web3 = self.get_web3(chain_name) if chain_name else self.w3
 
-        address = w3.to_checksum_address(address)
         if not abi:
             abi = ERC20_ABI
 
-        return w3.eth.contract(address=address, abi=abi)
+        return contract_cache.get(w3, address, abi)
+
+    def multicall(self, *calls, chain_name: str = None) -> list:
+        """Fetch several contract reads in one eth_call, serving immutable getters from the constants cache."""
+        w3: Web3 = self.get_web3(chain_name) if chain_name else self.w3
+        chain = chain_name or self.chain.name
+
+        results = {}
+        for index, call in enumerate(calls):
+            if constants_cache.is_constant(call):
+                value = constants_cache.get(chain, call)
+                if value is not None:
+                    results[index] = value
+
+        pending = [(index, call) for index, call in enumerate(calls) if index not in results]
+
+        if len(pending) == 1:
+            values = [pending[0][1].call()]
+        else:
+            values = Multicall(w3).add(*[call for _, call in pending]).execute()
+
+        for (index, call), value in zip(pending, values):
+            results[index] = value
+
+            if constants_cache.is_constant(call):
+                constants_cache.set(chain, call, value)
+
+        return [results[index] for index in range(len(calls))]
 
-    def get_token_info(self, token_address: str, chain: str = None, as_dict=False):
+    def get_token_info(self, token_address: str, chain: str = None, as_dict=False, spender: str = None):
+        """Return balance, decimals, symbol (and allowance for `spender`, if given) in one round trip."""
         token = self.get_contract(token_address, chain_name=chain)
 
-        balance = token.functions.balanceOf(self.address).call()
-        decimals = token.functions.decimals().call()
-        symbol = token.functions.symbol().call()
+        calls = [token.functions.balanceOf(self.address), token.functions.decimals(), token.functions.symbol()]
+        if spender:
+            calls.append(token.functions.allowance(self.address, spender))
+
+        info = self.multicall(*calls, chain_name=chain)
 
         if as_dict:
-            return {"balance": balance, "decimals": decimals, "symbol": symbol}
+            return dict(zip(["balance", "decimals", "symbol", "allowance"], info))
 
-        return balance, decimals, symbol
+        return tuple(info)
 
     def get_balance(self, token_address: str = None, chain_name: str = None, human=False) -> int:
         w3: Web3 = self.get_web3(chain_name) if chain_name else self.w3
 
         if token_address == None:
-            balance = w3.eth.get_balance(self.address)
+            balance, decimals = w3.eth.get_balance(self.address), 18
+        elif human:
+            token = self.get_contract(token_address, chain_name=chain_name)
+            balance, decimals = self.multicall(
+                token.functions.balanceOf(self.address), token.functions.decimals(), chain_name=chain_name
+            )
         else:
             token = self.get_contract(token_address, chain_name=chain_name)
             balance = token.functions.balanceOf(self.address).call()
@@ -75,70 +115,70 @@ class Wallet:
         if not human:
             return balance
 
-        decimals = token.functions.decimals().call() if token_address else 18
         return balance / 10**decimals
 
-    def await_token_balance(self, token_address: str, chain_name: str = None) -> bool:
-        original_balance, decimals, symbol = self.get_token_info(token_address, chain_name)
-        new_balance = self.get_balance(token_address, chain_name)
-        logger.info(f"{self.label} Awaiting {symbol} deposit")
-
-        while new_balance <= original_balance:
-            time.sleep(15)
-            new_balance = self.get_balance(token_address, chain_name)
-
-        logger.debug(f"{self.label} {new_balance / 10**decimals:.4f} {symbol} received on {chain_name.title()}\n")
-        return True
-
     def get_gas(self, tx: dict) -> dict:
-        if self.chain.eip_1559:
-            latest_block = self.w3.eth.get_block("latest")
-            base_fee = latest_block["baseFeePerGas"]
-            max_priority_fee = self.w3.eth.max_priority_fee
-            max_fee_per_gas = max_priority_fee + base_fee
+        tx.update(fee_oracle.get_fees(self.chain))
 
-            tx["maxFeePerGas"] = max_fee_per_gas
-            tx["maxPriorityFeePerGas"] = max_priority_fee
-
-        else:
-            tx["gasPrice"] = self.w3.eth.gas_price
-
-        tx["gas"] = self.w3.eth.estimate_gas(tx)
+        # chainId would make web3's validation middleware issue its own eth_chainId call
+        estimate_tx = {key: value for key, value in tx.items() if key != "chainId"}
+        tx["gas"] = self.w3.eth.estimate_gas(estimate_tx)
         return tx
 
     def get_tx_data(self, value=0, get_gas=False, **kwargs):
         tx = {
-            "chainId": self.w3.eth.chain_id,
+            "chainId": self.chain.chain_id,
             "from": self.address,
-            "nonce": self.w3.eth.get_transaction_count(self.address),
             "value": value,
             **kwargs,
         }
 
-        return self.get_gas(tx) if get_gas else tx
+        if get_gas:
+            tx = self.get_gas(tx)
+
+        # Taken last so a failed estimate doesn't burn a nonce
+        tx["nonce"] = self.next_nonce()
+        return tx
+
+    def build_contract_tx(self, contract_call, value=0) -> dict:
+        """Build a ready-to-sign tx for a contract call: fees from the fee oracle, then a plain eth_estimateGas."""
+        return self.get_tx_data(
+            value=value,
+            to=contract_call.address,
+            data=encode_call(contract_call),
+            get_gas=True,
+        )
 
     def sign_message(self, message: str) -> str:
         message_encoded = encode_defunct(text=message)
-        signed_message = self.account.sign_message(message_encoded)
+        signed_message = signer.sign_message(self.account.key, message_encoded)
 
         return "0x" + signed_message.signature.hex()
 
     def sign_tx(self, tx):
-        return self.w3.eth.account.sign_transaction(tx, self.account.key)
+        return signer.sign_transaction(self.account.key, tx)
+
+    def sign_txs(self, txs: list[dict]) -> list:
+        return signer.sign_transactions(self.account.key, txs)
 
     def send_tx(self, tx, tx_label="", gas_multiplier: float | None = None):
+        broadcast = False
+        self.last_receipt = None
+
         try:
             if gas_multiplier:
                 tx["gas"] = int(tx["gas"] * gas_multiplier)
 
             signed_tx = self.sign_tx(tx)
             tx_hash = self.w3.eth.send_raw_transaction(signed_tx.raw_transaction)
-            logger.info(f"{tx_label} [{self.tx_count}] | {self.chain.explorer}/tx/0x{tx_hash.hex()}")
+            broadcast = True
+            logger.info(f"{tx_label} [{tx['nonce'] + 1}] | {self.chain.explorer}/tx/0x{tx_hash.hex()}")
 
-            tx_receipt = self.w3.eth.wait_for_transaction_receipt(tx_hash, timeout=400)
+            tx_receipt = receipt_tracker.wait(self.chain.name, tx_hash, timeout=400)
 
             if tx_receipt.status:
-                logger.success(f"{tx_label} [{self.tx_count}] | Tx confirmed \n")
+                self.last_receipt = tx_receipt
+                logger.success(f"{tx_label} [{tx['nonce'] + 1}] | Tx confirmed \n")
                 return tx_hash.hex()
             else:
                 raise Web3Exception(f"Tx Failed \n")
@@ -158,19 +198,37 @@ class Wallet:
             else:
                 logger.error(err)
 
+        except TimeExhausted as err:
+            # The tx may have been dropped or underpriced, re-read the pending nonce instead of building on it
+            nonce_manager.reset(self.address, self.chain.name)
+            logger.error(f"{tx_label} | {err} \n")
+
         except Web3Exception as err:
             logger.error(f"{tx_label} | {err} \n")
 
+        finally:
+            # A nonce that never reached the mempool must be handed out again
+            if not broadcast:
+                nonce_manager.reset(self.address, self.chain.name)
+
     def check_allowance(self, token_address: str, spender: str) -> int:
         token = self.get_contract(token_address)
 
         return token.functions.allowance(self.address, spender).call()
 
-    def approve(self, token_address, spender, amount):
+    def approve(self, token_address, spender, amount, token_info: dict = None):
+        """`token_info` is a get_token_info(..., as_dict=True, spender=spender) result the caller already holds."""
         token = self.get_contract(token_address)
 
-        balance, decimals, symbol = self.get_token_info(token_address)
-        allowance = self.check_allowance(token_address, spender)
+        if not token_info or "allowance" not in token_info:
+            token_info = self.get_token_info(token_address, as_dict=True, spender=spender)
+
+        balance, decimals, symbol, allowance = (
+            token_info["balance"],
+            token_info["decimals"],
+            token_info["symbol"],
+            token_info["allowance"],
+        )
 
         if balance == 0:
             logger.info(f"{self.label} Your {symbol} balance is 0")
@@ -180,8 +238,7 @@ class Wallet:
             logger.warning(f"{self.label} {balance / 10 ** decimals:.4f} {symbol} Already approved")
             return
 
-        tx_data = self.get_tx_data()
-        tx = token.functions.approve(spender, amount).build_transaction(tx_data)
+        tx = self.build_contract_tx(token.functions.approve(spender, amount))
 
         status = self.send_tx(tx, tx_label=f"{self.label} Approve {amount / 10 ** decimals:.4f} {symbol}")
         time.sleep(random.randint(10, 15))
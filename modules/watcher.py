@@ -0,0 +1,126 @@
+import threading
+import time
+from concurrent.futures import Future
+from typing import Callable
+
+from web3.contract.contract import ContractFunction
+
+import settings
+from modules.config import ERC20_ABI
+from modules.contracts import contract_cache, encode_call
+from modules.logger import logger
+from modules.multicall import Multicall, MulticallError
+from modules.rpc import provider_pool
+
+
+class BalanceWatcher:
+    """Polls every awaited view call on a chain (balances, delivery flags) with one multicall per block."""
+
+    def __init__(self, poll_interval: float = 2):
+        self.poll_interval = poll_interval
+
+        # chain -> [(call, condition, future, deadline)]
+        self._expectations: dict[str, list[tuple[ContractFunction, Callable, Future, float | None]]] = {}
+        self._threads: dict[str, threading.Thread] = {}
+        self._lock = threading.Lock()
+
+    def expect_call(
+        self, chain_name: str, call: ContractFunction, condition: Callable, timeout: float = None
+    ) -> Future:
+        """Future resolving to the call result once `condition(result)` holds, or failing with TimeoutError."""
+        future = Future()
+        deadline = time.monotonic() + timeout if timeout is not None else None
+
+        with self._lock:
+            self._expectations.setdefault(chain_name, []).append((call, condition, future, deadline))
+
+            if chain_name not in self._threads:
+                thread = threading.Thread(target=self._watch, args=(chain_name,), daemon=True)
+                self._threads[chain_name] = thread
+                thread.start()
+
+        return future
+
+    def expect(self, chain_name: str, address: str, token: str, baseline: int, timeout: float = None) -> Future:
+        """Future resolving to the new balance once it rises above `baseline`, or failing with TimeoutError."""
+        w3 = provider_pool.get_web3(chain_name)
+        call = contract_cache.get(w3, token, ERC20_ABI).functions.balanceOf(address)
+
+        return self.expect_call(chain_name, call, lambda balance: balance > baseline, timeout)
+
+    def _discard(self, chain_name: str, future: Future) -> None:
+        with self._lock:
+            expectations = self._expectations.get(chain_name, [])
+            self._expectations[chain_name] = [item for item in expectations if item[2] is not future]
+
+    def _expire(self, chain_name: str, expectations: list) -> None:
+        now = time.monotonic()
+
+        for call, _, future, deadline in expectations:
+            # Resolved earlier in the same pass
+            if future.done():
+                continue
+
+            if deadline is not None and now > deadline:
+                self._discard(chain_name, future)
+                future.set_exception(
+                    TimeoutError(f"{call.fn_name} on {call.address} didn't reach the expected value in time")
+                )
+
+    def _fetch(self, chain_name: str, calls: list[ContractFunction]) -> dict[tuple[str, str], object]:
+        """Results keyed by (target, calldata) so identical calls from different waiters are read once.
+        A reverted call maps to its MulticallError, the others still resolve."""
+        unique = {(call.address, encode_call(call)): call for call in calls}
+        results = Multicall(provider_pool.get_web3(chain_name)).add(*unique.values()).execute(allow_failure=True)
+
+        return dict(zip(unique, results))
+
+    def _watch(self, chain_name: str) -> None:
+        try:
+            self._poll(chain_name)
+        except BaseException:
+            # Crashed: let the next expect_call start a fresh thread
+            with self._lock:
+                if self._threads.get(chain_name) is threading.current_thread():
+                    self._threads.pop(chain_name)
+            raise
+
+    def _poll(self, chain_name: str) -> None:
+        w3 = provider_pool.get_web3(chain_name)
+        last_block = None
+
+        while True:
+            with self._lock:
+                expectations = list(self._expectations.get(chain_name, []))
+
+                # Deregister under the same lock, so a concurrent expect_call starts a new thread
+                if not expectations:
+                    self._threads.pop(chain_name, None)
+                    return
+
+            try:
+                block_number = w3.eth.block_number
+
+                if block_number != last_block:
+                    results = self._fetch(chain_name, [call for call, _, _, _ in expectations])
+                    last_block = block_number
+
+                    for call, condition, future, _ in expectations:
+                        result = results[(call.address, encode_call(call))]
+
+                        if isinstance(result, MulticallError):
+                            self._discard(chain_name, future)
+                            if not future.done():
+                                future.set_exception(result)
+                        elif condition(result) and not future.done():
+                            self._discard(chain_name, future)
+                            future.set_result(result)
+
+            except Exception as err:
+                logger.warning(f"{chain_name.title()} balance polling failed: {err}")
+
+            self._expire(chain_name, expectations)
+            time.sleep(self.poll_interval)
+
+
+balance_watcher = BalanceWatcher(poll_interval=settings.BALANCE_POLL_INTERVAL)
@@ -1,11 +1,22 @@
 import random
+import time
+from concurrent.futures import Future
 
 from eth_abi import encode
+from hexbytes import HexBytes
 
 import settings
-from modules.config import HYPERLANE_DOMAINS, HYPERLANE_ROUTER, OUSDT, XERC20_ABI
+from modules.config import (
+    HYPERLANE_DISPATCH_ID_TOPIC,
+    HYPERLANE_DOMAINS,
+    HYPERLANE_MAILBOX_ABI,
+    HYPERLANE_ROUTER,
+    OUSDT,
+    XERC20_ABI,
+)
 from modules.logger import logger
 from modules.wallet import Wallet
+from modules.watcher import balance_watcher
 
 
 class HypXERC20(Wallet):
@@ -16,14 +27,15 @@ class HypXERC20(Wallet):
 
     @property
     def local_domain(self) -> int:
-        return self.router.functions.localDomain().call()
+        return self.multicall(self.router.functions.localDomain())[0]
 
     def get_random_dest(self) -> tuple:
         """Select a random destination from AVAILABLE_CHAINS, excluding current chain."""
+        local_domain = self.local_domain
         available_destinations = [
             (name, id)
             for name, id in HYPERLANE_DOMAINS.items()
-            if name in settings.AVAILABLE_CHAINS and id != self.local_domain
+            if name in settings.AVAILABLE_CHAINS and id != local_domain
         ]
         if not available_destinations:
             raise ValueError("No available destination chains")
@@ -45,25 +57,96 @@ class HypXERC20(Wallet):
                 return network_name
         return None
 
-    def transfer_remote(self, dest_id, token_in=OUSDT):
-        """Function: transferRemote(uint32 _destination,bytes32 _recipient,uint256 _amountOrId)"""
-        balance, decimals, symbol = self.get_token_info(token_in)
+    def _get_message_id(self, receipt) -> HexBytes | None:
+        """Hyperlane message ID from the origin Mailbox's DispatchId log."""
+        if not receipt:
+            return None
+
+        for log in receipt["logs"]:
+            topics = log["topics"]
+            if len(topics) > 1 and HexBytes(topics[0]) == HexBytes(HYPERLANE_DISPATCH_ID_TOPIC):
+                return HexBytes(topics[1])
+
+        return None
+
+    def expect_delivery(self, message_id: HexBytes, dest_chain: str) -> Future:
+        """Future resolving to True once the destination Mailbox reports the message as delivered, False if lost."""
+        dest_router = self.get_contract(HYPERLANE_ROUTER[dest_chain], abi=XERC20_ABI, chain_name=dest_chain)
+        mailbox_address = self.multicall(dest_router.functions.mailbox(), chain_name=dest_chain)[0]
+        mailbox = self.get_contract(mailbox_address, abi=HYPERLANE_MAILBOX_ABI, chain_name=dest_chain)
+
+        logger.info(f"{self.label} Awaiting message {message_id.to_0x_hex()} delivery")
+        started_at = time.monotonic()
+        delivery = Future()
+
+        def on_done(future: Future):
+            if future.exception():
+                logger.error(f"{self.label} Message {message_id.to_0x_hex()} not delivered to {dest_chain.title()} \n")
+                delivery.set_result(False)
+            else:
+                latency = time.monotonic() - started_at
+                logger.debug(f"{self.label} Message delivered on {dest_chain.title()} in {latency:.0f}s \n")
+                delivery.set_result(True)
+
+        balance_watcher.expect_call(
+            dest_chain,
+            mailbox.functions.delivered(message_id),
+            bool,
+            timeout=settings.HYPERLANE_DELIVERY_TIMEOUT,
+        ).add_done_callback(on_done)
+
+        return delivery
+
+    def _expect_balance(self, token: str, dest_chain: str) -> Future:
+        """Fallback when no message ID is available: resolves to True once the destination balance grows."""
+        balance, decimals, symbol = self.get_token_info(token, dest_chain)
+        logger.info(f"{self.label} Awaiting {symbol} deposit")
+        delivery = Future()
+
+        def on_done(future: Future):
+            if future.exception():
+                logger.error(f"{self.label} {symbol} not received on {dest_chain.title()}: {future.exception()} \n")
+                delivery.set_result(False)
+            else:
+                amount = future.result() / 10**decimals
+                logger.debug(f"{self.label} {amount:.4f} {symbol} received on {dest_chain.title()}\n")
+                delivery.set_result(True)
+
+        balance_watcher.expect(
+            dest_chain, self.address, token, balance, timeout=settings.HYPERLANE_DELIVERY_TIMEOUT
+        ).add_done_callback(on_done)
+        return delivery
+
+    def send_remote(self, dest_id, token_in=OUSDT) -> Future | bool:
+        """Function: transferRemote(uint32 _destination,bytes32 _recipient,uint256 _amountOrId)
+
+        Returns a Future resolving to the delivery status, or False if the transfer wasn't sent.
+        """
+        token = self.get_contract(token_in)
+        balance, decimals, symbol, allowance, value, local_domain = self.multicall(
+            token.functions.balanceOf(self.address),
+            token.functions.decimals(),
+            token.functions.symbol(),
+            token.functions.allowance(self.address, self.router.address),
+            self.router.functions.quoteGasPayment(dest_id),
+            self.router.functions.localDomain(),
+        )
 
         if balance == 0:
             logger.warning(f"{self.label} No balance to transfer \n")
             return False
 
         amount_in = balance
-        value = self._quote_gas(dest_id)
         recipient = self._encode_recipient()
 
-        self.approve(token_in, self.router.address, amount_in)
+        token_info = {"balance": balance, "decimals": decimals, "symbol": symbol, "allowance": allowance}
+        self.approve(token_in, self.router.address, amount_in, token_info=token_info)
 
-        contract_tx = self.router.functions.transferRemote(dest_id, recipient, balance).build_transaction(
-            self.get_tx_data(value=value)
+        contract_tx = self.build_contract_tx(
+            self.router.functions.transferRemote(dest_id, recipient, balance), value=value
         )
 
-        src_chain = self._get_network_name_by_id(self.local_domain)
+        src_chain = self._get_network_name_by_id(local_domain)
         dest_chain = self._get_network_name_by_id(dest_id)
 
         status = self.send_tx(
@@ -75,4 +158,10 @@ class HypXERC20(Wallet):
         if not status:
             return False
 
-        return self.await_token_balance(OUSDT, chain_name=dest_chain)
+        message_id = self._get_message_id(self.last_receipt)
+
+        if message_id is None:
+            logger.warning(f"{self.label} Couldn't find the dispatched message ID, tracking balance instead")
+            return self._expect_balance(token_in, dest_chain)
+
+        return self.expect_delivery(message_id, dest_chain)
@@ -5,6 +5,13 @@
 USE_PROXY = False
 SHUFFLE_WALLETS = False
 
+CONCURRENT_ACCOUNTS = 1  # accounts processed at once by "Swap and bridge", 1 = one after another
+PROCESSES = 1  # worker processes splitting keys.txt between them, 1 = run in this process
+USE_STEP_SCHEDULER = True  # park wallets waiting on bridge delivery/pauses instead of holding a thread each
+# Tx confirmations, approve()'s pause and refuel deposit checks still block a step thread while they wait,
+# so with many CONCURRENT_ACCOUNTS raise STEP_WORKERS towards the number of wallets confirming at once
+STEP_WORKERS = 8  # threads executing swap/bridge steps when USE_STEP_SCHEDULER is on
+
 SLEEP_BETWEEN_WALLETS = [20, 40]
 SLEEP_BETWEEN_ACTIONS = [20, 120]
 
@@ -14,6 +21,7 @@ SLEEP_BETWEEN_ACTIONS = [20, 120]
 
 SWAP_AMOUNT = [0.001, 0.002]
 SWAP_BACK_PERCENTAGE = [1, 1]  # 1 = 100%
+BEST_ROUTE = True  # quote Velodrome and Odos and swap where the output net of gas is higher, False = random DEX
 
 STARTING_CHAINS = ["base", "optimism"]  # optimism | base
 AVAILABLE_CHAINS = ["optimism", "base", "lisk", "soneium", "unichain", "mode", "superseed"]
@@ -21,3 +29,33 @@ AVAILABLE_CHAINS = ["optimism", "base", "lisk", "soneium", "unichain", "mode", "
 HOPS = [4, 5]  # 4-5 bridges
 
 REFUEL_AMOUNT = [0.00025, 0.00045]
+BEST_REFUEL = True  # quote Gas.zip and Relay and refuel with the better one, False = random provider
+REFUEL_PRICE_TOLERANCE = 0.02  # refuel quotes delivering within 2% of the best are ranked by fill time instead
+
+########################################################################
+#                         Performance Settings                         #
+########################################################################
+
+RPC_POOL_SIZE = 20  # max keep-alive connections, and in-flight requests, per chain RPC
+RPC_HEDGE_DELAY = 0.75  # seconds a read may take before it is raced on the next-fastest RPC of the chain, 0 = off
+CONSTANTS_CACHE_PATH = "cache/constants.json"  # decimals, symbols, Hyperlane domains, ...
+
+FEE_STRATEGY = "normal"  # slow | normal | fast (10th / 50th / 90th priority fee percentile)
+FEE_CACHE_TTL = 2  # seconds fee data is shared between wallets, ~1 block on OP-stack chains
+USE_FEE_HISTORY = True  # use eth_feeHistory, otherwise latest block + eth_maxPriorityFeePerGas
+RECEIPT_POLL_INTERVAL = 1  # seconds between block head checks while txs are pending
+BALANCE_POLL_INTERVAL = 2  # seconds between block head checks while awaiting bridged tokens
+HYPERLANE_DELIVERY_TIMEOUT = 1800  # seconds before an undelivered bridge message is reported as lost
+SNAPSHOT_WORKERS = 16  # threads fetching per-chain balances in parallel
+HTTP_POOL_SIZE = 10  # keep-alive connections per HTTP API and proxy, shared by every wallet using them
+API_CONCURRENCY = 8  # max in-flight requests per HTTP API (Odos, Relay, Gas.zip)
+RPC_RATE_LIMIT = 25  # requests per second per RPC endpoint, shared by all worker processes (0 = no limit)
+API_RATE_LIMIT = 5  # requests per second per HTTP API host, shared by all worker processes (0 = no limit)
+THROTTLE_RETRIES = 3  # times a throttled (429/5xx) request is queued again behind the rate limiter
+BREAKER_FAILURE_THRESHOLD = 3  # API failures in a row before swaps route around it (Odos -> Velodrome)
+QUOTE_DEADLINE = 2  # seconds to wait for swap and refuel quotes, later ones are dropped unless none has arrived
+BREAKER_PROBE_INTERVAL = 30  # seconds between background health checks of an API being routed around
+PRICE_CACHE_TTL = 60  # seconds the ETH price (Gas.zip limits) is shared between wallets
+SIGNER_PROCESSES = 0  # processes signing txs off the main process, 0 = sign inline
+COLLECT_METRICS = True  # per-method RPC/API latency, sizes and errors, summarized when the run ends
+METRICS_PATH = "logs/metrics.json"  # machine-readable dump of the same numbers
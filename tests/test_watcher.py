@@ -0,0 +1,108 @@
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+
+from modules import watcher
+from modules.multicall import MulticallError
+from modules.watcher import BalanceWatcher
+
+
+@pytest.fixture
+def chain(monkeypatch):
+    """A chain whose head moves on every poll, with `results` standing in for the multicall."""
+
+    class Eth:
+        head = 0
+
+        @property
+        def block_number(self):
+            self.head += 1
+            return self.head
+
+    w3 = SimpleNamespace(eth=Eth())
+
+    monkeypatch.setattr(watcher.provider_pool, "get_web3", lambda chain_name: w3)
+    monkeypatch.setattr(watcher, "encode_call", lambda call: call.data)
+
+    return SimpleNamespace(results={}, fetch_delay=0)
+
+
+def make_watcher(chain, watcher_class: type[BalanceWatcher] = BalanceWatcher) -> BalanceWatcher:
+    balance_watcher = watcher_class(poll_interval=0.01)
+
+    def fetch(chain_name, calls):
+        time.sleep(chain.fetch_delay)
+        return {(call.address, call.data): chain.results[call.data] for call in calls}
+
+    balance_watcher._fetch = fetch
+    return balance_watcher
+
+
+def make_call(data: str):
+    return SimpleNamespace(address="0xtoken", data=data, fn_name="balanceOf")
+
+
+def test_resolve_then_expire_keeps_the_watcher_running(chain):
+    balance_watcher = make_watcher(chain)
+    chain.results["late"] = 1
+    # The value arrives only after the deadline has passed, within the same pass
+    chain.fetch_delay = 0.1
+
+    late = balance_watcher.expect_call("base", make_call("late"), lambda value: value > 0, timeout=0.05)
+    assert late.result(timeout=2) == 1
+
+    chain.fetch_delay = 0
+    chain.results["next"] = 2
+    following = balance_watcher.expect_call("base", make_call("next"), lambda value: value > 0)
+    assert following.result(timeout=2) == 2
+
+
+def test_expired_expectation_fails_with_timeout(chain):
+    balance_watcher = make_watcher(chain)
+    chain.results["never"] = 0
+
+    future = balance_watcher.expect_call("base", make_call("never"), lambda value: value > 0, timeout=0.05)
+
+    with pytest.raises(TimeoutError):
+        future.result(timeout=2)
+
+
+def test_reverted_call_fails_only_its_waiter(chain):
+    balance_watcher = make_watcher(chain)
+    chain.results["reverts"] = MulticallError("balanceOf reverted on 0xtoken")
+    chain.results["ok"] = 5
+
+    reverted = balance_watcher.expect_call("base", make_call("reverts"), lambda value: value > 0, timeout=2)
+    resolved = balance_watcher.expect_call("base", make_call("ok"), lambda value: value > 0, timeout=2)
+
+    with pytest.raises(MulticallError):
+        reverted.result(timeout=2)
+    assert resolved.result(timeout=2) == 5
+
+
+def test_waiter_added_while_the_thread_exits_is_polled(chain):
+    exiting, release = threading.Event(), threading.Event()
+
+    class PausingWatcher(BalanceWatcher):
+        def _poll(self, chain_name):
+            super()._poll(chain_name)
+
+            # Hold the first thread between finishing its loop and ending
+            if not exiting.is_set():
+                exiting.set()
+                release.wait(2)
+
+    balance_watcher = make_watcher(chain, PausingWatcher)
+    chain.results["first"] = 1
+    chain.results["second"] = 2
+
+    first = balance_watcher.expect_call("base", make_call("first"), lambda value: value > 0)
+    assert first.result(timeout=2) == 1
+    assert exiting.wait(2)
+
+    second = balance_watcher.expect_call("base", make_call("second"), lambda value: value > 0)
+    release.set()
+
+    assert second.result(timeout=2) == 2